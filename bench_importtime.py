@@ -0,0 +1,100 @@
+"""
+Cold-start import budget for the apps.
+
+For each app, imports the modules its script imports at the top, in a
+fresh interpreter under `python -X importtime`, and adds up what they
+cost. `streamlit run` has already imported streamlit before the script
+starts, so the Streamlit apps are measured with it preloaded. Exits
+non-zero when an app goes over the budget:
+
+    python bench_importtime.py --budget-ms 150
+    python bench_importtime.py server.py --preload "" --budget-ms 900
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+APPS = ["test.py", "test2.py", "test3.py", "gpt.py"]
+BUDGET_MS = float(os.getenv("COLD_START_BUDGET_MS", "150"))
+MARKER = "--- app imports ---"
+
+
+def top_level_imports(path):
+    """Modules a script imports at module level, in order"""
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def measure(modules, preload):
+    """One cold run: {top-level module: cumulative microseconds} for modules imported after the preload"""
+    code = "; ".join(
+        [f"import {name}" for name in preload]
+        + [f"import sys; sys.stderr.write({MARKER!r} + '\\n')"]
+        + [f"import {name}" for name in modules]
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    costs, started = {}, False
+    for line in result.stderr.splitlines():
+        if line == MARKER:
+            started = True
+            continue
+        if not started or not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented; only top-level entries add up without double counting
+        if not name.startswith("  "):
+            costs[name.strip()] = int(cumulative)
+    return costs
+
+
+def profile_app(path, preload, runs):
+    modules = top_level_imports(path)
+    samples = [measure(modules, preload) for _ in range(runs + 1)][1:]  # First run warms the .pyc cache
+    totals = [sum(sample.values()) for sample in samples]
+    median = samples[totals.index(sorted(totals)[len(totals) // 2])]
+    slowest = sorted(median.items(), key=lambda item: -item[1])[:5]
+    return {
+        "import_ms": round(statistics.median(totals) / 1000, 1),
+        "slowest": {name: round(us / 1000, 1) for name, us in slowest},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the apps' cold-start import time against a budget")
+    parser.add_argument("apps", nargs="*", default=APPS, help="app scripts to measure")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="max import time per app")
+    parser.add_argument("--preload", default="streamlit", help="comma-separated modules loaded before the app")
+    parser.add_argument("--runs", type=int, default=3, help="cold runs per app; the median counts")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    args = parser.parse_args()
+
+    preload = [name for name in args.preload.split(",") if name]
+    report = {app: profile_app(app, preload, args.runs) for app in args.apps}
+    print(json.dumps(report, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    over = [app for app, result in report.items() if result["import_ms"] > args.budget_ms]
+    if over:
+        print(f"Over the {args.budget_ms:.0f} ms cold-start budget: {', '.join(over)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Per-session memory benchmark.
+
+Builds interview sessions with N turns the way the session store
+rehydrates them (state JSON loaded back into memory) and reports the
+bytes each session adds to the process, at several turn counts:
+
+    python bench_memory.py --sessions 50 --turns 10 50 100
+
+"dicts" is the old layout (messages as a list of dicts, a private copy of
+the system prompt and the full resume per session); "transcript" is the
+current one (interned system prompt, column-wise Transcript, resume
+excerpt only). Strings shared between sessions are counted once, so the
+numbers are what one more session costs.
+"""
+import argparse
+import json
+
+from context_window import RESUME_TOKEN_BUDGET, truncate_to_tokens
+from interview import InterviewState, build_messages, init_state, snapshot_state
+from loadtest import SAMPLE_CODE, SAMPLE_RESUME, deep_sizeof
+
+# A resume closer to a real two-page CV than the load test's one-liner
+FULL_RESUME = "\n".join([SAMPLE_RESUME] * 24)
+REPLY = (
+    "Nice! Your loop keeps a running sum and resets it when it drops below the current element, "
+    "which is exactly Kadane's idea. What happens with an all-negative array, and could you walk "
+    "me through the complexity? Also think about how you'd return the indices of the best window. "
+)
+
+
+def fake_session(session_no, turns):
+    """A finished-looking session with `turns` candidate/interviewer exchanges"""
+    state = init_state(InterviewState())
+    state.resume_text = FULL_RESUME
+    state.phase = "coding"
+    for turn in range(turns):
+        # Unique text per session and turn, like real conversations
+        user = SAMPLE_CODE if turn % 3 == 2 else f"[{session_no}.{turn}] My approach is a single pass with a running sum."
+        state.messages.append({"role": "user", "content": user + f" #{session_no}.{turn}"})
+        state.messages.append({"role": "assistant", "content": f"[{session_no}.{turn}] {REPLY}"})
+    return json.dumps(snapshot_state(state))
+
+
+def dicts_layout(payload):
+    return json.loads(payload)
+
+
+def transcript_layout(payload):
+    state = init_state(InterviewState(json.loads(payload)))
+    state.resume_text = truncate_to_tokens(state.resume_text, RESUME_TOKEN_BUDGET)
+    return state
+
+
+def per_session_bytes(states):
+    seen = set()
+    return round(sum(deep_sizeof(state, seen) for state in states) / len(states))
+
+
+def run(args):
+    report = {"sessions": args.sessions, "turns": {}}
+    for turns in args.turns:
+        payloads = [fake_session(i, turns) for i in range(args.sessions)]
+        dicts = [dicts_layout(payload) for payload in payloads]
+        transcripts = [transcript_layout(payload) for payload in payloads]
+        old, new = per_session_bytes(dicts), per_session_bytes(transcripts)
+        # Only the windowed messages are built for a request, however long the history
+        window = build_messages(transcripts[0])
+        report["turns"][turns] = {
+            "dicts_bytes": old,
+            "transcript_bytes": new,
+            "saved_pct": round(100 * (old - new) / old, 1),
+            "snapshot_bytes": round(sum(map(len, payloads)) / len(payloads)),
+            "request_messages": len(window),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-session memory at several turn counts")
+    parser.add_argument("--sessions", type=int, default=50, help="sessions per measurement")
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 50, 100], help="turn counts to measure")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = run(args)
+    print(json.dumps(report, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
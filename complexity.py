@@ -0,0 +1,228 @@
+import copy
+import math
+import random
+import string
+import time
+import tracemalloc
+
+from restricted_env import SandboxError, SandboxTimeout, arm, disarm, load_submission, run_sandboxed
+
+# Sizes start here and double up to the problem's max_n
+MIN_SIZE = 64
+# Stop growing n before one call would take this long, or once the whole run has
+CALL_BUDGET = 0.25
+PROFILE_BUDGET = 4.0
+# Small inputs are looped until a sample takes at least this long, to get above timer noise
+MIN_SAMPLE_TIME = 0.005
+MAX_LOOPS = 200
+# Peak memory growth below this many bytes counts as constant space
+SPACE_FLOOR = 4096
+
+# (label, growth function, tier); classes in one tier are treated as equally good
+COMPLEXITY_CLASSES = [
+    ("O(1)", lambda n: 1.0, 0),
+    ("O(log n)", lambda n: math.log2(n), 0),
+    ("O(n)", lambda n: n, 1),
+    ("O(n log n)", lambda n: n * math.log2(n), 1),
+    ("O(n^2)", lambda n: n ** 2, 2),
+    ("O(n^3)", lambda n: n ** 3, 3),
+]
+TIERS = {label: tier for label, _, tier in COMPLEXITY_CLASSES}
+
+
+def _int_array(n, rng):
+    return ([rng.randint(-10 ** 5, 10 ** 5) for _ in range(n)],)
+
+
+def _two_sum(n, rng):
+    nums = rng.sample(range(-10 ** 9, 10 ** 9), n)
+    # The pair sits at the end: the worst case for a single pass
+    return nums, nums[-1] + nums[-2]
+
+
+def _brackets(n, rng):
+    pairs = ["()", "[]", "{}"]
+    stack, out = [], []
+    while len(out) + len(stack) < n:
+        if stack and rng.random() < 0.5:
+            out.append(stack.pop())
+        else:
+            opening, closing = rng.choice(pairs)
+            out.append(opening)
+            stack.append(closing)
+    return ("".join(out) + "".join(reversed(stack)),)
+
+
+def _grid(n, rng):
+    side = max(1, math.isqrt(n))
+    return ([[rng.choice("10") for _ in range(side)] for _ in range(side)],)
+
+
+def _text(n, rng):
+    return ("".join(rng.choice(string.printable[:95]) for _ in range(n)),)
+
+
+def _word_pair(n, rng):
+    return tuple("".join(rng.choice("abcde") for _ in range(n)) for _ in range(2))
+
+
+def _word_list(n, rng):
+    words = ["".join(rng.choice("abcdef") for _ in range(5)) for _ in range(n)]
+    return words[0], words[-1], words
+
+
+def _window(n, rng):
+    return [rng.randint(-10 ** 4, 10 ** 4) for _ in range(n)], max(1, n // 10)
+
+
+# Input generators named by a problem's "profile" spec; each returns the call's args for size n
+GENERATORS = {
+    "int_array": _int_array,
+    "two_sum": _two_sum,
+    "brackets": _brackets,
+    "grid": _grid,
+    "text": _text,
+    "word_pair": _word_pair,
+    "word_list": _word_list,
+    "window": _window,
+}
+
+
+def sizes(max_n, min_n=MIN_SIZE):
+    """Geometric sizes from min_n doubling up to max_n, always ending at max_n"""
+    result = []
+    n = min(min_n, max_n)
+    while n < max_n:
+        result.append(n)
+        n *= 2
+    result.append(max_n)
+    return result
+
+
+def fit(samples, floor=0.0):
+    """
+    Pick the complexity class that best explains (n, cost) samples.
+    Each class is scaled by its median ratio and scored by squared error
+    in log space; ties go to the cheaper class.
+    """
+    points = [(n, cost) for n, cost in samples if cost > floor]
+    if len(points) < 2:
+        return COMPLEXITY_CLASSES[0][0]
+    best_label, best_error = None, None
+    for label, growth, _ in COMPLEXITY_CLASSES:
+        logs = [math.log(cost) - math.log(growth(n) or 1.0) for n, cost in points]
+        scale = sorted(logs)[len(logs) // 2]
+        error = sum((value - scale) ** 2 for value in logs)
+        # Prefer the cheaper class unless the next one fits clearly better
+        if best_error is None or error < best_error * 0.8:
+            best_label, best_error = label, error
+    return best_label
+
+
+def _time_call(entry, args):
+    """Seconds per call, looping quick calls; inputs are copied so in-place solutions see fresh data"""
+    total, loops = 0.0, 0
+    while loops < MAX_LOOPS and (loops == 0 or total < MIN_SAMPLE_TIME):
+        fresh = copy.deepcopy(args)
+        started = time.perf_counter()
+        entry(*fresh)
+        total += time.perf_counter() - started
+        loops += 1
+    return total / loops
+
+
+def _peak_memory(entry, args):
+    fresh = copy.deepcopy(args)
+    tracemalloc.start()
+    try:
+        entry(*fresh)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _profile(code, function, generator, max_n, seed):
+    """Sandboxed task: time and trace the submission on growing inputs"""
+    entry = load_submission(code, function)
+    rng = random.Random(seed)
+    samples, started = [], time.perf_counter()
+    for n in sizes(max_n):
+        args = GENERATORS[generator](n, rng)
+        try:
+            arm(CALL_BUDGET * 4)
+            seconds = _time_call(entry, args)
+            # tracemalloc slows Python code several times over
+            arm(CALL_BUDGET * 16)
+            peak = _peak_memory(entry, args)
+        except SandboxTimeout:
+            break
+        finally:
+            disarm()
+        samples.append((n, seconds, peak))
+        # Doubling n costs up to 4x for quadratic code; don't start a size that would blow the budget
+        if seconds * 4 > CALL_BUDGET or time.perf_counter() - started > PROFILE_BUDGET:
+            break
+    return samples
+
+
+class ComplexityReport:
+    """Measured time/space growth of a submission, with the raw (n, seconds, peak bytes) samples"""
+
+    __slots__ = ("time", "space", "samples", "max_n", "error")
+
+    def __init__(self, samples, max_n, error=None):
+        self.samples = samples
+        self.max_n = max_n
+        self.error = error
+        self.time = fit([(n, seconds) for n, seconds, _ in samples]) if samples else None
+        self.space = fit([(n, peak) for n, _, peak in samples], floor=SPACE_FLOOR) if samples else None
+
+    def __repr__(self):
+        return f"ComplexityReport(time={self.time}, space={self.space}, sizes={len(self.samples)})"
+
+    def slower_than(self, optimal):
+        """Whether the measured time class is a tier worse than `optimal`"""
+        return self.time is not None and optimal in TIERS and TIERS[self.time] > TIERS[optimal]
+
+    def summary(self):
+        """Short plain-text report for the evaluation prompt"""
+        if self.error:
+            return f"Could not profile the code: {self.error}"
+        if not self.samples:
+            return "Could not profile the code: no input size finished in time."
+        n, seconds, peak = self.samples[-1]
+        reached = "" if n == self.max_n else f" (stopped early; limit is n={self.max_n})"
+        return (
+            f"Measured time ~{self.time}, extra space ~{self.space}; "
+            f"n={n} took {seconds * 1000:.2f} ms and peaked at {peak / 1024:.1f} KB{reached}."
+        )
+
+
+def _is_sample(sample):
+    return (
+        isinstance(sample, (list, tuple)) and len(sample) == 3
+        and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in sample)
+    )
+
+
+def profile(code, spec, function=None, seed=0):
+    """
+    Measure a submission's growth on generated inputs.
+    `spec` is a problem's {"input": generator name, "max_n": int}.
+    Returns a ComplexityReport.
+    """
+    max_n = spec["max_n"]
+    try:
+        samples = run_sandboxed(
+            _profile, code, function, spec["input"], max_n, seed,
+            time_limit=CALL_BUDGET * 16, cases=math.ceil(PROFILE_BUDGET / CALL_BUDGET),
+        )
+    except SandboxError as e:
+        return ComplexityReport([], max_n, error=str(e))
+    except Exception as e:
+        return ComplexityReport([], max_n, error=f"{type(e).__name__}: {e}")
+    # Samples come back from the sandbox as JSON; keep only well-formed (n, seconds, peak) rows
+    if not isinstance(samples, list):
+        samples = []
+    samples = [tuple(sample) for sample in samples if _is_sample(sample)]
+    return ComplexityReport(samples, max_n)
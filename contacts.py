@@ -0,0 +1,120 @@
+import re
+from urllib.parse import unquote, urlsplit
+
+# One alternation, so the resume text and its link targets are scanned in a single pass.
+# Emails go first: "sam@github.io" is an address, not a link.
+CONTACT_PATTERN = re.compile(
+    r"(?P<email>(?:mailto:)?[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,})"
+    r"|(?P<url>(?:https?://|www\.)[^\s<>\"'|]+|(?:[\w-]+\.)?(?:linkedin\.com|github\.com)/[^\s<>\"'|]+)"
+    r"|(?P<phone>(?:tel:)?\+?\(?\d{1,4}\)?(?:[ .-]?\(?\d{2,4}\)?){2,4}\d)",
+    re.IGNORECASE,
+)
+# Link-text punctuation that ends a sentence rather than the URL
+TRAILING_PUNCTUATION = ".,;:!?)]}'\""
+# Phone numbers have 10-15 digits (E.164); shorter runs are dates, years and IDs
+MIN_PHONE_DIGITS = 10
+MAX_PHONE_DIGITS = 15
+DIGIT_GROUPS = re.compile(r"\d+")
+# Without a leading "+", "(" or "tel:", a number must be written in groups that aren't all years
+YEAR = re.compile(r"(?:19|20)\d\d")
+# Paths that are not a GitHub user
+GITHUB_RESERVED = frozenset({"about", "orgs", "topics", "features", "sponsors", "settings"})
+
+
+class Contacts:
+    """Contact details found in a resume, normalized and deduplicated in order of appearance"""
+
+    __slots__ = ("emails", "phones", "linkedin", "github", "urls")
+
+    FIELDS = __slots__
+
+    def __init__(self, emails=(), phones=(), linkedin=(), github=(), urls=()):
+        self.emails = list(emails)
+        self.phones = list(phones)
+        self.linkedin = list(linkedin)  # linkedin.com/in/<handle>
+        self.github = list(github)  # github.com/<user>
+        self.urls = list(urls)  # Portfolios and anything else, without scheme or "www."
+
+    def __repr__(self):
+        return f"Contacts({self.to_dict()})"
+
+    def __bool__(self):
+        return any(getattr(self, field) for field in self.FIELDS)
+
+    def _add(self, field, value):
+        values = getattr(self, field)
+        if value and value not in values:
+            values.append(value)
+
+    def to_dict(self):
+        """Plain dict with only the fields that were found, for session snapshots"""
+        return {field: getattr(self, field) for field in self.FIELDS if getattr(self, field)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: data.get(field, ()) for field in cls.FIELDS})
+
+    def channels(self):
+        """How to reach the candidate, best first: an email, then LinkedIn, then a phone"""
+        return self.emails[:1] + self.linkedin[:1] + ([] if self.emails else self.phones[:1])
+
+
+def normalize_email(value):
+    if value.lower().startswith("mailto:"):
+        value = unquote(value[7:]).split("?")[0]
+    return value.strip(TRAILING_PUNCTUATION).lower()
+
+
+def normalize_phone(value):
+    """Digits with a leading + kept, or "" if it can't be a phone number"""
+    linked = value.lower().startswith("tel:")
+    value = value[4:] if linked else value
+    groups = []
+    # Stop at the group that completes a number, so a year after it ("555 0132 2018") is left out
+    for chunk in value.split():
+        groups += DIGIT_GROUPS.findall(chunk)
+        if sum(map(len, groups)) >= MIN_PHONE_DIGITS:
+            break
+    digits = "".join(groups)
+    if not MIN_PHONE_DIGITS <= len(digits) <= MAX_PHONE_DIGITS:
+        return ""
+    if not (linked or value.lstrip().startswith(("+", "("))):
+        # A bare run of digits is an ID; "2019 2020 2021" is a run of dates
+        if len(groups) < 2 or all(YEAR.fullmatch(group) for group in groups):
+            return ""
+    return ("+" if value.lstrip().startswith("+") else "") + digits
+
+
+def classify_url(value):
+    """(field, normalized value) for a URL: host lowercased, scheme, "www." and trailing "/" dropped"""
+    value = value.rstrip(TRAILING_PUNCTUATION)
+    parts = urlsplit(value if "://" in value else f"https://{value}")
+    host = parts.hostname or ""
+    host = host[4:] if host.startswith("www.") else host
+    segments = [segment for segment in unquote(parts.path).split("/") if segment]
+    if host.endswith("linkedin.com") and len(segments) >= 2 and segments[0] in ("in", "pub"):
+        return "linkedin", f"linkedin.com/in/{segments[1].lower()}"
+    if host == "github.com" and segments and segments[0].lower() not in GITHUB_RESERVED:
+        # Repository links point at the owner's profile
+        return "github", f"github.com/{segments[0].lower()}"
+    path = parts.path.rstrip("/")
+    query = f"?{parts.query}" if parts.query else ""
+    return "urls", f"{host}{path}{query}" if host else ""
+
+
+def extract_contacts(text, links=()):
+    """
+    Find emails, phone numbers, LinkedIn and GitHub profiles and other
+    URLs in resume text plus its link annotations, in one regex pass
+    """
+    contacts = Contacts()
+    # Link targets (mailto:, tel:, https:) are scanned as one more line of text
+    for match in CONTACT_PATTERN.finditer("\n".join([text, *links])):
+        kind = match.lastgroup
+        if kind == "email":
+            contacts._add("emails", normalize_email(match.group()))
+        elif kind == "phone":
+            contacts._add("phones", normalize_phone(match.group()))
+        else:
+            contacts._add(*classify_url(match.group()))
+    return contacts
@@ -0,0 +1,98 @@
+import functools
+import os
+import time
+
+# Token budget for everything sent with one chat completion request. Counted
+# with tiktoken (requirements.txt); without it, or until its BPE file loads,
+# counts are estimated at ~4 characters per token
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "3000"))
+# Share of that budget the resume excerpt may take up
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "800"))
+# Most recent messages that are always sent verbatim
+MIN_RECENT_MESSAGES = 4
+# Framing tokens the chat format adds around each message
+MESSAGE_OVERHEAD = 4
+
+# Seconds before loading the BPE file is tried again after a failure (e.g. offline)
+ENCODING_RETRY_S = 300.0
+
+_encoding = None
+_encoding_loaded = False
+_encoding_retry_at = 0.0
+
+
+def _get_encoding():
+    """Return the tiktoken encoding, or None if it is unavailable; tiktoken is imported on first use"""
+    global _encoding, _encoding_loaded, _encoding_retry_at
+    if not _encoding_loaded and time.monotonic() >= _encoding_retry_at:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("cl100k_base")
+            _encoding_loaded = True
+        except ImportError:  # Fall back to a character-based estimate
+            _encoding_loaded = True
+        except Exception:
+            # The BPE file could not be loaded; estimate meanwhile, without a fetch per message
+            _encoding_retry_at = time.monotonic() + ENCODING_RETRY_S
+    return _encoding
+
+
+def count_tokens(text):
+    """Count tokens in text locally; falls back to ~4 characters per token without tiktoken"""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return _count_encoded(text)
+    return (len(text) + 3) // 4
+
+
+@functools.lru_cache(maxsize=4096)
+def _count_encoded(text):
+    # History repeats every turn, so exact counts are cached; estimates are cheap and never are
+    return len(_encoding.encode(text))
+
+
+def count_message_tokens(message):
+    return count_tokens(message["content"]) + MESSAGE_OVERHEAD
+
+
+def truncate_to_tokens(text, budget):
+    """Cut text down to at most `budget` tokens"""
+    if count_tokens(text) <= budget:
+        return text
+    encoding = _get_encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text)[:budget])
+    return text[:budget * 4]
+
+
+def build_window(system_messages, history, summaries=(), budget=PROMPT_TOKEN_BUDGET,
+                 min_recent=MIN_RECENT_MESSAGES, trailing=()):
+    """
+    Assemble the messages for one request within a token budget.
+
+    System messages always go first, followed by one message listing the
+    summaries of compacted phases. History is then added newest-first
+    until the budget is spent; the last `min_recent` messages are kept
+    even if they go over it. `trailing` messages go last and count
+    against the budget. History dicts are reused, not copied.
+    """
+    payload = list(system_messages)
+    if summaries:
+        payload.append({
+            "role": "system",
+            "content": "Earlier in this interview:\n" + "\n".join(f"- {summary}" for summary in summaries),
+        })
+    used = sum(count_message_tokens(msg) for msg in payload)
+    used += sum(count_message_tokens(msg) for msg in trailing)
+
+    window = []
+    for msg in reversed(history):
+        cost = count_message_tokens(msg)
+        if len(window) >= min_recent and used + cost > budget:
+            break
+        window.append(msg)
+        used += cost
+    payload.extend(reversed(window))
+    payload.extend(trailing)
+    return payload
@@ -0,0 +1,229 @@
+import json
+import re
+
+from stream_renderer import StreamRenderer
+
+REVIEW_TOOL_NAME = "record_evaluation"
+
+# Points per rubric item; together they make the 33 points a challenge is worth
+RUBRIC = {"correctness": 15, "complexity": 10, "clarity": 8}
+MAX_SCORE = sum(RUBRIC.values())
+VERDICTS = ("pass", "revise", "fail")
+DIFFICULTIES = ("EASY", "MEDIUM", "HARD")
+
+EVALUATION_TOOL = {
+    "type": "function",
+    "function": {
+        "name": REVIEW_TOOL_NAME,
+        "description": (
+            "Review the candidate's code submission. Put everything the candidate "
+            "should read in `feedback`; the scores are private and never shown."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "feedback": {
+                    "type": "string",
+                    "description": "Your reply to the candidate, in your usual interview voice",
+                },
+                **{
+                    name: {"type": "integer", "minimum": 0, "maximum": points}
+                    for name, points in RUBRIC.items()
+                },
+                "verdict": {
+                    "type": "string",
+                    "enum": list(VERDICTS),
+                    "description": "pass: solid, move on; revise: let them fix it; fail: move on without a fix",
+                },
+                "next_difficulty": {"type": "string", "enum": list(DIFFICULTIES)},
+            },
+            "required": ["feedback", *RUBRIC, "verdict", "next_difficulty"],
+            "additionalProperties": False,
+        },
+    },
+}
+REVIEW_TOOL_CHOICE = {"type": "function", "function": {"name": REVIEW_TOOL_NAME}}
+
+
+class EvaluationError(ValueError):
+    """Raised when tool call arguments don't match the evaluation schema"""
+
+
+class Evaluation:
+    """One structured code review: candidate-facing feedback plus private subscores"""
+
+    __slots__ = ("feedback", "correctness", "complexity", "clarity", "verdict", "next_difficulty")
+
+    def __init__(self, feedback, correctness, complexity, clarity, verdict, next_difficulty):
+        self.feedback = feedback
+        self.correctness = correctness
+        self.complexity = complexity
+        self.clarity = clarity
+        self.verdict = verdict
+        self.next_difficulty = next_difficulty
+
+    def __repr__(self):
+        return f"Evaluation({self.verdict}, {self.score}/{MAX_SCORE}, next={self.next_difficulty})"
+
+    @property
+    def score(self):
+        return self.correctness + self.complexity + self.clarity
+
+    @property
+    def final(self):
+        """Whether the challenge is over; "revise" keeps waiting for new code"""
+        return self.verdict != "revise"
+
+
+def parse_evaluation(arguments):
+    """Validate the JSON arguments of a record_evaluation call and return an Evaluation"""
+    try:
+        data = json.loads(arguments)
+    except json.JSONDecodeError as e:
+        raise EvaluationError(f"Evaluation is not valid JSON: {e}") from None
+    if not isinstance(data, dict):
+        raise EvaluationError("Evaluation must be a JSON object")
+
+    feedback = data.get("feedback")
+    if not isinstance(feedback, str) or not feedback.strip():
+        raise EvaluationError("Evaluation is missing feedback")
+    scores = {}
+    for name, points in RUBRIC.items():
+        value = data.get(name)
+        # bool is an int subclass; reject it along with out-of-range scores
+        if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= points:
+            raise EvaluationError(f"{name} must be an integer from 0 to {points}, got {value!r}")
+        scores[name] = value
+    verdict = data.get("verdict")
+    if verdict not in VERDICTS:
+        raise EvaluationError(f"Unknown verdict {verdict!r}")
+    next_difficulty = str(data.get("next_difficulty", "")).upper()
+    if next_difficulty not in DIFFICULTIES:
+        raise EvaluationError(f"Unknown difficulty {data.get('next_difficulty')!r}")
+    return Evaluation(feedback.strip(), verdict=verdict, next_difficulty=next_difficulty, **scores)
+
+
+_FEEDBACK_START = re.compile(r'"feedback"\s*:\s*"')
+_HEX4 = re.compile(r"[0-9a-fA-F]{4}")
+# Stands in for escapes that don't decode to a character
+_REPLACEMENT = "\ufffd"
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+def _hex4(digits):
+    """The value of a \\u escape's four hex digits, or None if they aren't any"""
+    return int(digits, 16) if _HEX4.fullmatch(digits) else None
+
+
+class ReviewStream:
+    """
+    Collect a streamed review reply and surface its feedback as it arrives.
+
+    The evaluation comes back as tool call arguments, so the candidate-facing
+    text is a JSON string inside them. `feed` decodes that string
+    incrementally and returns the new characters, letting the reply stream
+    like any other turn. Plain content (a model that answers without the
+    tool) is passed straight through.
+    """
+
+    def __init__(self):
+        self._content = []
+        self._arguments = ""
+        self._feedback = []
+        self._pos = None  # Index of the next undecoded feedback character
+        self._closed = False
+
+    def feed(self, chunk):
+        """Take one completion chunk and return the newly visible text"""
+        if not chunk.choices:
+            return ""
+        delta = chunk.choices[0].delta
+        text = delta.content or ""
+        if text:
+            self._content.append(text)
+        for call in delta.tool_calls or ():
+            if call.function and call.function.arguments:
+                text += self._feed_arguments(call.function.arguments)
+        return text
+
+    def _feed_arguments(self, piece):
+        self._arguments += piece
+        if self._closed:
+            return ""
+        if self._pos is None:
+            match = _FEEDBACK_START.search(self._arguments)
+            if not match:
+                return ""
+            self._pos = match.end()
+
+        buf, i, out = self._arguments, self._pos, []
+        while i < len(buf):
+            char = buf[i]
+            if char == '"':
+                self._closed = True
+                i += 1
+                break
+            if char != "\\":
+                out.append(char)
+                i += 1
+                continue
+            # Escapes may be split across chunks; wait for the rest
+            if i + 1 >= len(buf):
+                break
+            if buf[i + 1] != "u":
+                out.append(_ESCAPES.get(buf[i + 1], buf[i + 1]))
+                i += 2
+                continue
+            if i + 6 > len(buf):
+                break
+            code = _hex4(buf[i + 2:i + 6])
+            if code is None:
+                # Malformed escape: show a replacement character; result() then falls back to the streamed text
+                out.append(_REPLACEMENT)
+                i += 2
+            elif 0xD800 <= code < 0xDC00:
+                # Surrogate pair: needs the low half too
+                if i + 8 > len(buf):
+                    break
+                if buf[i + 6:i + 8] != "\\u":
+                    out.append(_REPLACEMENT)
+                    i += 6
+                    continue
+                if i + 12 > len(buf):
+                    break
+                low = _hex4(buf[i + 8:i + 12])
+                if low is None or not 0xDC00 <= low < 0xE000:
+                    # Lone high half; whatever follows is decoded on its own
+                    out.append(_REPLACEMENT)
+                    i += 6
+                    continue
+                out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                i += 12
+            else:
+                out.append(_REPLACEMENT if 0xDC00 <= code < 0xE000 else chr(code))
+                i += 6
+        self._pos = i
+        text = "".join(out)
+        self._feedback.append(text)
+        return text
+
+    def result(self):
+        """Return (reply text, Evaluation or None) once the stream is done"""
+        if self._arguments:
+            try:
+                evaluation = parse_evaluation(self._arguments)
+                return evaluation.feedback, evaluation
+            except EvaluationError:
+                pass
+        return ("".join(self._content) + "".join(self._feedback)).strip(), None
+
+
+def render_review(placeholder, response, **kwargs):
+    """Stream a review reply into a placeholder and return (text, Evaluation or None)"""
+    renderer = StreamRenderer(placeholder, **kwargs)
+    review = ReviewStream()
+    for chunk in response:
+        renderer.write(review.feed(chunk))
+    text, evaluation = review.result()
+    renderer.finish(text)
+    return text, evaluation
@@ -1,15 +1,19 @@
 import os
+import secrets
+from collections import deque
 import streamlit as st
 from dotenv import load_dotenv
-from openai import OpenAI
-from langchain.memory import ConversationBufferWindowMemory
+from llm_client import get_client, prewarm
+from rate_limiter import get_scheduler
+from stream_renderer import render_stream
+from transcript import ExchangeRing
 
 # Load environment variables
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API")
 
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+# The OpenAI SDK loads in the background; the shared client is built on the first turn
+prewarm()
 
 # Set the Streamlit page configuration
 st.set_page_config(page_title="GPT Chatbot", layout="wide")
@@ -27,12 +31,21 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Initialize session state for messages and memory
+SYSTEM_PROMPT = "You are a helpful assistant."
+# Past exchanges sent along with each message
+MEMORY_EXCHANGES = 2
+# Messages kept on screen; older ones scroll out of the session
+RENDER_HISTORY = 200
+
+# Initialize session state for messages
 if "messages" not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = deque(maxlen=RENDER_HISTORY)
 
 if "memory" not in st.session_state:
-    st.session_state.memory = ConversationBufferWindowMemory(k=2, memory_key="chat_history", return_messages=True)
+    st.session_state.memory = ExchangeRing(MEMORY_EXCHANGES)
+
+if "session_key" not in st.session_state:
+    st.session_state.session_key = secrets.token_hex(8)  # Fair-queuing key for the rate-limit scheduler
 
 # Display chat messages
 for message in st.session_state.messages:
@@ -42,52 +55,30 @@ for message in st.session_state.messages:
 # Handle user input
 input_prompt = st.chat_input("Type your message here...")
 if input_prompt:
-    # Add user message to session state and memory
+    # Add user message to session state
     st.session_state.messages.append({"role": "user", "content": input_prompt})
-    st.session_state.memory.save_context({"input": input_prompt}, {"output": ""})  # Save user input to memory
     
     with st.chat_message("user"):
         st.markdown(input_prompt)
 
     with st.chat_message("assistant"):
         message_placeholder = st.empty()
-        full_response = ""
-
-        # Get the chat history from memory
-        memory_content = st.session_state.memory.load_memory_variables({})["chat_history"]
-        messages = [
-            {"role": "system", "content": "You are a helpful assistant."}
-        ]
-        
-        # Add previous conversation from memory
-        for mem in memory_content:
-            if mem.type == "human":  # HumanMessage for user input
-                messages.append({"role": "user", "content": mem.content})
-            elif mem.type == "ai":  # AIMessage for assistant response
-                messages.append({"role": "assistant", "content": mem.content})
-        
-        # Add the current user input
-        messages.append({"role": "user", "content": input_prompt})
 
         # Get response from OpenAI with memory context
-        response = client.chat.completions.create(
-            model="gpt-4o",  
-            messages=messages,
+        response = get_scheduler().create(
+            get_client(OPENAI_API_KEY),
+            session=st.session_state.session_key,
+            model="gpt-4o",
+            messages=st.session_state.memory.payload(SYSTEM_PROMPT, input_prompt),
             stream=True
         )
 
-        # Stream the response
-        for chunk in response:
-            content = chunk.choices[0].delta.content or ""
-            full_response += content
-            message_placeholder.markdown(full_response + "▌")
-        
-        # Finalize the message without the cursor
-        message_placeholder.markdown(full_response)
+        # Stream the response, repainting at a capped frame rate
+        full_response = render_stream(message_placeholder, response)
         
-        # Add assistant response to session state and memory
+        # Add assistant response to session state
         st.session_state.messages.append({"role": "assistant", "content": full_response})
-        st.session_state.memory.save_context({"input": input_prompt}, {"output": full_response})
+        st.session_state.memory.record(input_prompt, full_response)
 
 # Footer (optional, kept minimal)
 st.markdown("""
@@ -0,0 +1,233 @@
+"""
+Bulk resume ingestion.
+
+Parses a directory (or list) of PDF and DOCX resumes across a process
+pool, with the same extraction the upload path uses, into a resume store
+keyed by content hash:
+
+    python ingest_resumes.py resumes/ --out resume_store --workers 4
+
+Point the app at the store with RESUME_STORE_DIR=resume_store and open an
+interview with ?resume=<content hash> (or upload the same file): the
+resume is served from the store without being parsed again.
+
+Each file is parsed and fails on its own; failures are recorded in the
+index and skipped on the next run unless --retry-failed is given. Results
+are appended as they arrive and the index is checkpointed every
+--checkpoint files, so an interrupted run picks up where it stopped. Add
+--parquet to also export the store as a Parquet table (needs pyarrow).
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import resume_parser
+from contacts import extract_contacts
+from resume_cache import content_hash
+from resume_store import ResumeStore
+
+MIME_TYPES = {
+    ".pdf": resume_parser.PDF_TYPE,
+    ".docx": resume_parser.DOCX_TYPES[0],
+    ".doc": resume_parser.DOCX_TYPES[1],
+}
+
+
+def find_resumes(paths):
+    """Resume files under `paths` (files or directories), sorted within each directory"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if os.path.splitext(name)[1].lower() in MIME_TYPES:
+                        yield os.path.join(root, name)
+        elif os.path.splitext(path)[1].lower() in MIME_TYPES:
+            yield path
+
+
+def file_stat(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+
+def _init_worker():
+    # Each worker is already one process of the pool; parse large PDFs in-process
+    resume_parser.POOL_WORKERS = 1
+
+
+def parse_resume(path):
+    """
+    Pool task: read and parse one file. Returns a store record, or
+    {"error": ...}; nothing raised here reaches the other files.
+    """
+    source = dict(file_stat(path), path=os.path.abspath(path))
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        key = content_hash(data)
+        text, links = resume_parser.extract_text_and_links(data, MIME_TYPES[os.path.splitext(path)[1].lower()])
+    except Exception as e:
+        return {"source": source, "error": f"{type(e).__name__}: {e}"}
+    if not text:
+        return {"source": source, "hash": key, "error": "no text found"}
+    return {
+        "hash": key,
+        "text": text,
+        "links": links,
+        "contacts": extract_contacts(text, links).to_dict(),
+        "source": source,
+    }
+
+
+def _new_pool(workers):
+    # spawn, like resume_parser's pool: nothing of the parent process is inherited
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker)
+
+
+def parse_alone(path):
+    """parse_resume in a pool of its own, so a crash only fails this file"""
+    with _new_pool(1) as pool:
+        try:
+            return pool.submit(parse_resume, path).result()
+        except BrokenProcessPool:
+            return {"source": dict(file_stat(path), path=path), "error": "parser process crashed"}
+
+
+def run_pool(paths, workers):
+    """
+    Yield parse_resume(path) for every path, `workers` at a time, as they
+    finish. A worker that dies breaks the whole pool, so the files that
+    were in flight are parsed again one by one and the rest of the batch
+    goes on in a fresh pool.
+    """
+    pending = list(reversed(paths))
+    while pending:
+        crashed = []
+        with _new_pool(workers) as pool:
+            running = {}
+            while pending or running:
+                while pending and len(running) < workers and not crashed:
+                    path = pending.pop()
+                    running[pool.submit(parse_resume, path)] = path
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = running.pop(future)
+                    try:
+                        yield future.result()
+                    except BrokenProcessPool:
+                        crashed.append(path)
+        for path in crashed:
+            yield parse_alone(path)
+
+
+def ingest(paths, store, workers, retry_failed=False, checkpoint_every=50):
+    """Parse every new or changed file in `paths` into `store`; returns a summary dict"""
+    recovered = store.recover()
+    todo, skipped = [], 0
+    for path in dict.fromkeys(os.path.abspath(path) for path in find_resumes(paths)):
+        # Unchanged files that were stored, or failed, on an earlier run are skipped
+        seen = store.files.get(path)
+        if seen and (seen["size"], seen["mtime"]) == tuple(file_stat(path).values()):
+            if seen.get("hash") in store or ("error" in seen and not retry_failed):
+                skipped += 1
+                continue
+        todo.append(path)
+
+    parsed = duplicates = 0
+    failures = {}
+    started = time.perf_counter()
+    for count, record in enumerate(run_pool(todo, workers), 1):
+        source = record["source"]
+        entry = {"size": source["size"], "mtime": source["mtime"]}
+        if "error" in record:
+            failures[source["path"]] = record["error"]
+            store.files[source["path"]] = dict(entry, error=record["error"])
+        elif record["hash"] in store:
+            # Same content under another name: index the path, keep one copy
+            duplicates += 1
+            store.files[source["path"]] = dict(entry, hash=record["hash"])
+        else:
+            store.append(record)
+            store.files[source["path"]] = dict(entry, hash=record["hash"])
+            parsed += 1
+        if count % checkpoint_every == 0:
+            store.checkpoint()
+    store.checkpoint()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "store": store.directory,
+        "files": len(todo) + skipped,
+        "parsed": parsed,
+        "duplicates": duplicates,
+        "skipped": skipped,
+        "recovered": recovered,
+        "failed": len(failures),
+        "failures": failures,
+        "resumes": len(store),
+        "workers": workers,
+        "elapsed_s": round(elapsed, 3),
+        "files_per_s": round(len(todo) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def export_parquet(store, path):
+    """Write the store as one Parquet table, one row per resume; needs pyarrow"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = [
+        {
+            "hash": record["hash"],
+            "text": record["text"],
+            "links": record["links"],
+            "contacts": json.dumps(record.get("contacts", {})),
+            "source": record.get("source", {}).get("path"),
+        }
+        for record in store.records()
+    ]
+    schema = pa.schema([
+        ("hash", pa.string()),
+        ("text", pa.string()),
+        ("links", pa.list_(pa.string())),
+        ("contacts", pa.string()),
+        ("source", pa.string()),
+    ])
+    pq.write_table(pa.Table.from_pylist(rows, schema=schema), path, compression="zstd")
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse a batch of resumes into a resume store")
+    parser.add_argument("paths", nargs="+", help="resume files or directories to scan")
+    parser.add_argument("--out", default=os.getenv("RESUME_STORE_DIR") or "resume_store", help="resume store directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parser processes")
+    parser.add_argument("--checkpoint", type=int, default=50, help="write the index every N files")
+    parser.add_argument("--retry-failed", action="store_true", help="parse files that failed on a previous run again")
+    parser.add_argument("--parquet", help="also export the store to this Parquet file")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    args = parser.parse_args()
+
+    store = ResumeStore(args.out)
+    report = ingest(args.paths, store, max(1, args.workers), args.retry_failed, max(1, args.checkpoint))
+    if args.parquet:
+        try:
+            report["parquet_rows"] = export_parquet(store, args.parquet)
+        except ImportError:
+            print("pyarrow is not installed; skipping the Parquet export", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,463 @@
+import copy
+
+from complexity import profile
+from contacts import Contacts, extract_contacts
+from context_window import RESUME_TOKEN_BUDGET, truncate_to_tokens
+from evaluation import EVALUATION_TOOL, RUBRIC, REVIEW_TOOL_CHOICE
+from model_router import choose_route
+from personas import DEFAULT_PERSONA, get_persona
+from problem_bank import get_problem_bank
+from rate_limiter import GREETING_PRIORITY, TURN_PRIORITY
+from prompt_builder import state_note
+from reply_classifier import classify_input, classify_reply
+from restricted_env import extract_code, run_tests
+from resume_cache import content_hash, get_resume_cache
+from resume_index import get_resume_index
+from transcript import Transcript
+
+# The system prompts ask for 2-3 challenges
+MAX_CHALLENGES = 3
+
+
+class InterviewState(dict):
+    """Session state outside Streamlit: a dict with attribute access, like st.session_state"""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+
+# Interview keys and their defaults
+STATE_DEFAULTS = {
+    "persona": lambda: DEFAULT_PERSONA,  # Name of the interviewer style, fixed for the session
+    "messages": Transcript,  # Filled with the persona's opening by init_state
+    "phase": lambda: "introduction",
+    "history_start": lambda: 1,  # Index of the first message sent verbatim
+    "phase_summaries": list,
+    "candidate_name": str,
+    "resume_text": str,
+    "resume_contacts": dict,  # Contacts.to_dict() of the uploaded resume
+    "resume_hash": str,
+    "challenge_count": int,
+    "scores": list,
+    "difficulty": lambda: "MEDIUM",
+    "resume_questions_asked": int,
+    "coding_ready": bool,
+    "awaiting_clarification": bool,
+    "awaiting_approach": bool,
+    "awaiting_code": bool,
+    "problem_presented": bool,
+    "problems_seen": list,  # Titles of problems handed out so far
+    "attempts_used": int,  # Reviewed submissions of the current challenge
+    "test_report": lambda: None,  # Local test results for this turn's submission
+    "complexity_report": lambda: None,  # Measured growth of this turn's submission
+}
+# Per-turn reports are rebuilt on the next submission and never persisted
+TRANSIENT_KEYS = {"test_report", "complexity_report"}
+
+
+def init_state(state, persona=None):
+    """Fill in any missing interview keys on st.session_state or an InterviewState"""
+    if "persona" not in state:
+        state["persona"] = get_persona(persona).name
+    if "messages" not in state:
+        state["messages"] = Transcript(get_persona(state["persona"]).opening())
+    for key, factory in STATE_DEFAULTS.items():
+        if key not in state:
+            state[key] = factory()
+    # Snapshots store messages as a list of dicts
+    if not isinstance(state["messages"], Transcript):
+        state["messages"] = Transcript(state["messages"])
+    return state
+
+
+def snapshot_state(state):
+    """Plain dict of the interview keys worth persisting between processes"""
+    data = {key: state[key] for key in STATE_DEFAULTS if key in state and key not in TRANSIENT_KEYS}
+    if isinstance(data.get("messages"), Transcript):
+        data["messages"] = data["messages"].to_list()
+    return data
+
+
+def persona_of(state):
+    """The session's Persona"""
+    return get_persona(state.persona)
+
+
+# Function to soften tone; the prefixes raise no events, so `events` stays valid
+def soften_tone(response, events):
+    if "correctness" in events:
+        response = f"Love the effort! {response}"
+    elif "what" in events and "question_mark" in events:
+        response = f"Fun question! {response}"
+    elif "not_quite" in events or "miss" in events:
+        response = f"No worries—let’s tweak it! {response}"
+    return response.strip()
+
+
+def resume_sections(state):
+    """The resume sections most relevant to the last question and the candidate's answer"""
+    def load():
+        # Sessions keep only an excerpt; the full text is in the shared resume cache
+        cached = get_resume_cache().get(state.resume_hash) if state.resume_hash else None
+        return cached[0] if cached else state.resume_text
+
+    key = state.resume_hash or content_hash(state.resume_text.encode())
+    query = " ".join(message["content"] for message in state.messages[-2:])
+    return get_resume_index(key, load).excerpt(query)
+
+
+def attach_resume(state, resume_hash, text, links):
+    """
+    Give the session a parsed resume, uploaded or pre-parsed by
+    ingest_resumes.py. Returns False if it already has this one.
+    """
+    if not text or resume_hash == state.resume_hash:
+        return False
+    # Sections are indexed once per resume; each turn only pulls the ones it needs
+    get_resume_index(resume_hash, lambda: text)
+    state.resume_hash = resume_hash
+    # Sessions keep a bounded excerpt; the full text stays in the shared resume cache
+    state.resume_text = truncate_to_tokens(text, RESUME_TOKEN_BUDGET)
+    # Contact details are pulled out once, so the model never has to look for them
+    state.resume_contacts = extract_contacts(text, links).to_dict()
+    return True
+
+
+def preload_resume(state, resume_hash):
+    """
+    Start the session with a resume parsed ahead of time, looked up by
+    content hash in the resume cache; False if it isn't there
+    """
+    if not resume_hash or state.resume_hash:
+        return False
+    entry = get_resume_cache().get(resume_hash)
+    return entry is not None and attach_resume(state, resume_hash, *entry)
+
+
+def build_messages(state):
+    """Assemble the chat completion messages for the current turn"""
+    persona = persona_of(state)
+    # Volatile state goes in a trailing note so the system prompt stays byte-stable
+    resume_excerpt = None
+    if state.phase == "resume_review" and state.resume_text:
+        resume_excerpt = resume_sections(state)
+    difficulty = state.difficulty if state.phase == "coding" else None
+    test_results = state.test_report.summary() if state.test_report else None
+    complexity = complexity_summary(state)
+    attempts_left = None
+    if persona.max_attempts and state.phase == "coding" and state.awaiting_code:
+        attempts_left = persona.max_attempts - state.attempts_used
+    note = state_note(state.phase, difficulty, resume_excerpt, test_results, complexity, attempts_left)
+
+    # Older phases go in as summaries; recent turns are sent verbatim within the budget
+    return persona.prompts.build(state.messages[state.history_start:], state.phase_summaries, note)
+
+
+def request_priority(state):
+    """First replies (to the candidate's introduction) queue behind interviews already under way"""
+    return GREETING_PRIORITY if len(state.messages) <= 3 else TURN_PRIORITY
+
+
+def request_route(state):
+    """Model route for the next reply: the strong model only for code reviews and the rundown"""
+    return choose_route(state, MAX_CHALLENGES)
+
+
+def request_temperature(state):
+    """Sampling temperature of the session's persona"""
+    return persona_of(state).temperature
+
+
+def review_options(state):
+    """Extra completion arguments: the code-review turn returns a structured evaluation"""
+    if state.phase == "coding" and state.awaiting_code:
+        return {"tools": [EVALUATION_TOOL], "tool_choice": REVIEW_TOOL_CHOICE}
+    return {}
+
+
+def compact_history(state, summary, include_reply=True):
+    """Replace the messages so far with a short summary in future prompts"""
+    state.phase_summaries.append(summary)
+    # This turn's reply is appended after post-processing; fold it in too if asked
+    state.history_start = len(state.messages) + (1 if include_reply else 0)
+
+
+def update_phase(state, events):
+    """Update phase based on AI response"""
+    if "wrap_up" in events:
+        state.phase = "conclusion"
+
+
+def next_problem(state):
+    """Take the next problem at the current difficulty from the bank"""
+    problem = get_problem_bank().next(state.difficulty, state.problems_seen)
+    state.problems_seen.append(problem["title"])
+    return problem["statement"]
+
+
+def start_coding(state):
+    """Move into the coding phase and return the first challenge"""
+    state.coding_ready = True
+    state.phase = "coding"
+    state.challenge_count = 1
+    state.problem_presented = True
+    name = state.candidate_name or "you"
+    compact_history(state, f"Warm-up with {name} done ({state.resume_questions_asked} resume questions); moved on to coding.", include_reply=False)
+    return persona_of(state).lines["first_challenge"].format(name=name, statement=next_problem(state))
+
+
+def present_next_challenge(state):
+    """Hand out the next challenge as soon as the last one is scored"""
+    lines = persona_of(state).lines
+    state.problem_presented = True
+    state.awaiting_clarification = True
+    statement = next_problem(state)
+    # This reply is folded into the last challenge's summary, so restate the problem there
+    state.phase_summaries.append(f"Challenge {state.challenge_count} ({state.difficulty}) presented: {statement}")
+    return lines["next_challenge"].format(statement=statement) + lines["clarify"]
+
+
+def handle_coding_transition(state, user_events, ai_response, events):
+    """Handle transition to coding phase"""
+    if "ready_for_coding" in events:
+        if "yes" in user_events or "sure" in user_events:
+            ai_response = start_coding(state)
+            return ai_response, classify_reply(ai_response)
+        elif "no" in user_events:
+            state.coding_ready = False
+    elif not state.coding_ready and "whats_up" in events:
+        if "ready" in user_events:
+            ai_response = start_coding(state)
+            return ai_response, classify_reply(ai_response)
+    return ai_response, events
+
+
+def ask_clarification_questions(state, ai_response, events):
+    """Manage clarification questions for coding problems"""
+    if (state.phase == "coding" and
+        state.challenge_count > 0 and
+        state.problem_presented and
+        not state.awaiting_clarification and
+        "coding_challenge" in events):
+        state.awaiting_clarification = True
+        persona = persona_of(state)
+        return ai_response + persona.lines["clarify"], events.merge(persona.clarify_events)
+    return ai_response, events
+
+
+def evaluate_approach(state, ai_response, events):
+    """Evaluate candidate's approach and prompt for code"""
+    lines = persona_of(state).lines
+    if state.awaiting_clarification and "clarify_prompt" in events:
+        state.awaiting_clarification = False
+        state.awaiting_approach = True
+        return lines["approach"], classify_reply(lines["approach"])
+    elif state.awaiting_approach:
+        if "code_it_up" in events or "nice" in events:
+            state.awaiting_approach = False
+            state.awaiting_code = True
+            state.problem_presented = False  # Reset for next problem
+            # Get the next problem ready for every difficulty while they code
+            get_problem_bank().prefetch(state.problems_seen)
+            return lines["code"], classify_reply(lines["code"])
+    return ai_response, events
+
+
+def update_difficulty_and_score(state, events):
+    """Update difficulty and score based on AI feedback; returns True once the challenge is scored"""
+    if "correctness" in events and state.phase == "coding" and state.awaiting_code:
+        if "correct" in events and "optimal" in events:
+            score = events.score if events.score is not None else 25
+            close_challenge(state, score, persona_of(state).next_difficulty(score))
+            return True
+    return False
+
+
+def close_challenge(state, score, difficulty, outcome=None):
+    """Record a challenge's score and set the difficulty of the next one"""
+    state.scores.append(score)
+    outcome = outcome or f"scored {score}/33"
+    compact_history(state, f"Challenge {state.challenge_count} ({state.difficulty}): {outcome}.")
+    state.awaiting_code = False
+    state.attempts_used = 0
+    state.challenge_count += 1
+    state.difficulty = difficulty
+
+
+def out_of_attempts(state, events, evaluation):
+    """Count a reviewed submission; True once the persona's attempt limit is used up"""
+    limit = persona_of(state).max_attempts
+    if not limit or not state.awaiting_code or (evaluation is None and "correctness" not in events):
+        return False
+    state.attempts_used += 1
+    if state.attempts_used < limit:
+        return False
+    close_challenge(state, 0, persona_of(state).clamp("EASY"), f"all {limit} attempts used, scored 0/33")
+    return True
+
+
+def record_evaluation(state, evaluation):
+    """Score a challenge from a structured review; returns True once the challenge is over"""
+    if not evaluation.final:
+        return False  # Let them tweak it and resubmit
+    if state.test_report and state.test_report.total:
+        # Correctness can't beat the share of test cases that actually passed
+        cap = round(RUBRIC["correctness"] * state.test_report.pass_rate)
+        evaluation.correctness = min(evaluation.correctness, cap)
+    optimal = current_problem(state).get("profile", {}).get("optimal")
+    if state.complexity_report and state.complexity_report.slower_than(optimal):
+        # Measured a tier slower than the target: at most half the complexity points
+        evaluation.complexity = min(evaluation.complexity, RUBRIC["complexity"] // 2)
+    close_challenge(state, evaluation.score, persona_of(state).clamp(evaluation.next_difficulty))
+    return True
+
+
+def current_problem(state):
+    """The problem handed out last, or an empty dict"""
+    if not state.problems_seen:
+        return {}
+    return get_problem_bank().get(state.problems_seen[-1]) or {}
+
+
+def complexity_summary(state):
+    """Measured complexity plus the target, for the state note"""
+    if not state.complexity_report:
+        return None
+    optimal = current_problem(state).get("profile", {}).get("optimal")
+    target = f" Target: {optimal}." if optimal else ""
+    return state.complexity_report.summary() + target
+
+
+def check_submission(state, user_input):
+    """Run a code submission against the current problem's tests, then profile it if they all pass"""
+    state.test_report = None
+    state.complexity_report = None
+    if state.phase != "coding" or not state.awaiting_code:
+        return
+    problem = current_problem(state)
+    if not problem.get("tests"):
+        return
+    code = extract_code(user_input)
+    state.test_report = run_tests(code, problem["tests"], problem.get("function"))
+    # Growth only means something for code that works
+    if problem.get("profile") and state.test_report.total and state.test_report.pass_rate == 1:
+        state.complexity_report = profile(code, problem["profile"], problem.get("function"))
+
+
+def start_turn(state, user_input):
+    """
+    Record the candidate's message, advance past the introduction and test
+    any code; returns a checkpoint for cancel_turn
+    """
+    # Lists are copied: the turn appends to them in place
+    checkpoint = {key: copy.copy(state[key]) for key in STATE_DEFAULTS if key not in TRANSIENT_KEYS | {"messages"}}
+    checkpoint["messages"] = len(state.messages)
+    state.messages.append({"role": "user", "content": user_input})
+    check_submission(state, user_input)
+
+    # After introduction, grab name and move on to the resume; without one,
+    # finish_turn hands out the first challenge instead
+    if state.phase == "introduction":
+        state.candidate_name = user_input.split()[0]  # Simple name grab
+        if state.resume_text:
+            state.phase = "resume_review"
+    return checkpoint
+
+
+def cancel_turn(state, checkpoint):
+    """Undo start_turn when no reply came, so the next request doesn't carry two user turns in a row"""
+    for key, value in checkpoint.items():
+        if key != "messages":
+            state[key] = value
+    state.messages = Transcript(state.messages.to_list()[:checkpoint["messages"]])
+    state.test_report = None
+    state.complexity_report = None
+
+
+def finish_turn(state, user_input, ai_response, evaluation=None):
+    """Run the post-processing chain on a finished reply, store it and return it"""
+    persona = persona_of(state)
+    # Scan each text once; stages that rewrite the reply hand back its new events
+    events = classify_reply(ai_response)
+    user_events = classify_input(user_input)
+    if persona.soften:
+        ai_response = soften_tone(ai_response, events)
+
+    # Resume review phase: ask warm-up questions
+    if state.phase == "resume_review":
+        state.resume_questions_asked += 1
+        if state.resume_questions_asked >= 2:
+            ai_response, events = persona.lines["ready"], classify_reply(persona.lines["ready"])
+
+    # No resume to talk about: the first challenge follows the introduction,
+    # with no model reply to replace (see needs_model)
+    if state.phase == "introduction":
+        ai_response = start_coding(state)
+        events = classify_reply(ai_response)
+
+    # Handle coding transition
+    ai_response, events = handle_coding_transition(state, user_events, ai_response, events)
+
+    # Coding phase: clarification and approach
+    if state.phase == "coding":
+        clarifying = state.awaiting_clarification
+        ai_response, events = ask_clarification_questions(state, ai_response, events)
+        # A challenge handed out this turn stays on screen until the candidate has asked away
+        if clarifying or not state.awaiting_clarification:
+            ai_response, events = evaluate_approach(state, ai_response, events)
+        if evaluation is not None:
+            scored = record_evaluation(state, evaluation)
+        else:
+            scored = update_difficulty_and_score(state, events)
+        # Personas with an attempt limit move on after the last failed submission
+        scored = scored or out_of_attempts(state, events, evaluation)
+        if scored and state.challenge_count <= MAX_CHALLENGES:
+            ai_response += "\n\n" + present_next_challenge(state)
+
+    # Update phase for conclusion; contact details come from the resume, not the model
+    concluding = state.phase != "conclusion"
+    update_phase(state, events)
+    if concluding and state.phase == "conclusion":
+        ai_response = add_contact_line(state, persona, ai_response)
+
+    state.messages.append({"role": "assistant", "content": ai_response})
+    if state.phase == "conclusion" and persona.closing:
+        close_interview(state, persona)
+    return ai_response
+
+
+def add_contact_line(state, persona, ai_response):
+    """Say how the candidate will be reached, using the contacts extracted at upload"""
+    channels = Contacts.from_dict(state.resume_contacts).channels()
+    if not channels:
+        return ai_response
+    return ai_response + "\n\n" + persona.lines["contact"].format(channels=" or ".join(channels))
+
+
+def close_interview(state, persona):
+    """Replace the chat with the persona's closing line once the rundown is out"""
+    state.messages = Transcript([
+        {"role": "system", "content": persona.system_prompt},
+        {"role": "assistant", "content": persona.closing},
+    ])
+    state.history_start = 1
+    state.phase_summaries = []
+
+
+def needs_model(state):
+    """
+    False for a turn the engine answers by itself, once start_turn has run:
+    an introduction without a resume is followed straight by the first challenge
+    """
+    return state.phase != "introduction"
+
+
+def accepts_input(state):
+    """False once an interview whose persona closes the chat has concluded"""
+    return not (state.phase == "conclusion" and persona_of(state).closing)
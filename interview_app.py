@@ -0,0 +1,172 @@
+"""
+Streamlit front end of the interview engine, shared by every persona.
+
+test.py, test2.py and test3.py only pick the default persona; one
+deployment serves all of them, selected per session with ?persona=chill,
+?persona=hard-mode or ?persona=professional. Parsed resumes, the OpenAI
+client, rendered prompt prefixes and the sandbox pool are process-wide,
+so every persona shares them. Resumes bulk-parsed by ingest_resumes.py
+can be attached up front with ?resume=<content hash>.
+
+The ?sid= query parameter is the whole session credential: anyone with
+the URL (shared, bookmarked, leaked through logs or the Referer header)
+can open and continue that interview. Treat interview links as secrets,
+or use server.py, which keeps the id in an HttpOnly cookie instead.
+"""
+import os
+import secrets
+import time
+import streamlit as st
+from dotenv import load_dotenv
+import resume_parser
+from evaluation import render_review
+from interview import (
+    InterviewState, accepts_input, attach_resume, build_messages, cancel_turn, finish_turn, init_state, needs_model,
+    persona_of, preload_resume, request_priority, request_route, request_temperature, review_options, snapshot_state,
+    start_turn,
+)
+from llm_client import get_client, prewarm
+from metrics import USAGE_OPTIONS, TurnMetrics, get_metrics
+from model_router import ROUTES, route_stats
+from rate_limiter import get_scheduler
+from resume_cache import get_resume_cache
+from session_store import get_session_store
+from stream_renderer import render_stream
+
+
+# Function to extract text and links from resume
+def extract_text_and_links(file):
+    """
+    Extract text and hyperlinks from an uploaded PDF or DOCX file.
+    Returns a tuple: (text_content, list_of_hyperlinks)
+    """
+    try:
+        with get_metrics().timer("resume_parse"):
+            return resume_parser.extract_text_and_links(file.getvalue(), file.type)
+    except Exception as e:
+        st.error(f"Error processing file: {str(e)}")
+        return "", []
+
+
+def get_ai_response(state, placeholder, turn, api_key, session_id):
+    """Stream the reply on the turn's model route; returns (text, evaluation or None), or None on failure"""
+    # The SDK is loaded by now: get_client imports it
+    from openai import OpenAIError
+
+    options = review_options(state)
+    route = turn.route = request_route(state)
+    with turn.stage("prompt"):
+        messages = build_messages(state)
+    client = get_client(api_key)
+    started = time.perf_counter()
+    try:
+        # Queued fairly across sessions within the org's rate limits; 429s and 5xx are retried
+        response = get_scheduler().create(
+            client,
+            session=session_id,
+            priority=request_priority(state),
+            messages=messages,
+            temperature=request_temperature(state),
+            stream=True,
+            **ROUTES[route],
+            **USAGE_OPTIONS,
+            **options
+        )
+        response = turn.watch(response, started)
+        # Code reviews come back as a tool call carrying both the scores and the reply
+        if options:
+            reply = render_review(placeholder, response)
+        else:
+            reply = render_stream(placeholder, response), None
+    except OpenAIError as e:
+        st.error(f"Error getting a response: {str(e)}")
+        return None
+    route_stats.record(route, time.perf_counter() - started)
+    return reply
+
+
+def run_app(default_persona):
+    """Render the interview page; new sessions take ?persona= or `default_persona`"""
+    # Load environment variables
+    load_dotenv()
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        st.error("API key not found. Please set OPENAI_API_KEY in your .env file.")
+        st.stop()
+    # The OpenAI SDK loads in the background; the shared client is built on the first turn
+    prewarm()
+
+    # Set up Streamlit
+    st.set_page_config(page_title="RecrewAI", layout="wide")
+    st.header("RecrewAI - Technical Interview Assistant")
+
+    # Interviews survive reloads and restarts: the URL carries a session id (see
+    # the module docstring) and the state is written behind to SQLite after
+    # every turn. The page keeps only that id; the interview lives in the
+    # shared store, whose memory budget drops idle ones from RAM until their
+    # next rerun.
+    sessions = get_session_store(restore=InterviewState, snapshot=snapshot_state)
+    session_id = st.query_params.get("sid") or secrets.token_urlsafe(16)
+    st.query_params["sid"] = session_id
+    state = sessions.get(session_id)
+    if state is None:
+        state = sessions.add(session_id, InterviewState())
+
+    # Initialize session state; the persona is fixed once the interview exists
+    init_state(state, st.query_params.get("persona") or default_persona)
+    persona = persona_of(state)
+    # Batch-ingested resumes (ingest_resumes.py) are handed over as ?resume=<content hash>
+    preload_resume(state, st.query_params.get("resume"))
+
+    # Sidebar with resume upload
+    with st.sidebar:
+        st.subheader("Upload Resume")
+        uploaded_file = st.file_uploader("Choose PDF or DOCX", type=["pdf", "docx", "doc"])
+        if uploaded_file:
+            # Parsed resumes are cached by content hash, so reruns skip parsing
+            resume_hash, text, links = get_resume_cache().get_or_extract(uploaded_file, extract_text_and_links)
+            if attach_resume(state, resume_hash, text, links):
+                sessions.save(session_id, state)
+            if text:
+                st.success(persona.resume_notice)
+
+        st.subheader("Tips")
+        st.markdown(persona.tips)
+
+    # Display chat messages
+    with get_metrics().timer("render", state.phase):
+        for message in state.messages[1:]:
+            with st.chat_message(message["role"]):
+                st.markdown(message["content"])
+
+    if not accepts_input(state):
+        st.write(f"The interview has concluded. {persona.closing}.")
+        return
+
+    # Handle user input
+    if user_input := st.chat_input("Type your response..."):
+        turn = TurnMetrics(state.phase)
+        with turn.stage("checks"):
+            checkpoint = start_turn(state, user_input)
+
+        # Stream AI response below the candidate's message; turns the engine
+        # answers by itself skip the request
+        with st.chat_message("user"):
+            st.markdown(user_input)
+        if not needs_model(state):
+            reply = "", None
+        else:
+            with st.chat_message("assistant"):
+                reply = get_ai_response(state, st.empty(), turn, api_key, session_id)
+        if reply is None:
+            # Out of retries: drop the unanswered message so it can be sent again
+            cancel_turn(state, checkpoint)
+            return
+        ai_response, evaluation = reply
+
+        # Phase transitions and coding flow run on the finished reply
+        with turn.stage("postprocess"):
+            finish_turn(state, user_input, ai_response, evaluation)
+        turn.finish()
+        sessions.save(session_id, state)
+        st.rerun()
@@ -0,0 +1,151 @@
+import importlib
+import os
+import threading
+
+# Keep-alive pool shared by every session in the process
+MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "60"))
+
+# Explicit timeouts; the read timeout is per chunk, so it also bounds stream stalls
+CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("OPENAI_READ_TIMEOUT", "60"))
+WRITE_TIMEOUT = 10.0
+POOL_TIMEOUT = 10.0
+
+
+class PoolStats:
+    """
+    Count requests and new connections through the shared pool.
+
+    New TCP connections and TLS handshakes are observed through httpcore's
+    trace extension, so `reuse_ratio` is the share of requests that rode
+    on an already open keep-alive connection.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        with self._lock:
+            requests, connections, tls = self.requests, self.connections, self.tls_handshakes
+        reuse_ratio = 1 - connections / requests if requests else 0.0
+        return {
+            "requests": requests,
+            "connections": connections,
+            "tls_handshakes": tls,
+            "reuse_ratio": round(max(reuse_ratio, 0.0), 3),
+        }
+
+    def _trace(self, event_name, info):
+        with self._lock:
+            if event_name == "connection.connect_tcp.complete":
+                self.connections += 1
+            elif event_name == "connection.start_tls.complete":
+                self.tls_handshakes += 1
+
+    async def _atrace(self, event_name, info):
+        self._trace(event_name, info)
+
+    def on_request(self, request):
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def on_request_async(self, request):
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._atrace
+
+
+pool_stats = PoolStats()
+
+_clients = {}
+_async_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _limits():
+    import httpx
+
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout():
+    import httpx
+
+    return httpx.Timeout(connect=CONNECT_TIMEOUT, read=READ_TIMEOUT, write=WRITE_TIMEOUT, pool=POOL_TIMEOUT)
+
+
+_prewarm_started = threading.Event()
+
+
+def prewarm():
+    """
+    Import the SDK in a background thread. openai is the slowest import in
+    the apps, so they call this instead of building the client at start-up;
+    the page paints meanwhile and the first turn finds the modules loaded.
+    """
+    if _prewarm_started.is_set():
+        return
+    _prewarm_started.set()
+    threading.Thread(
+        target=lambda: [importlib.import_module(name) for name in ("httpx", "openai")],
+        name="openai-prewarm",
+        daemon=True,
+    ).start()
+
+
+def get_client(api_key=None):
+    """
+    Return the process-wide OpenAI client for an API key.
+
+    Streamlit re-executes app scripts on every interaction but keeps
+    imported modules, so the client and its connection pool live here
+    and every rerun and session reuses the same warm connections.
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            import httpx
+            from openai import OpenAI
+
+            http_client = httpx.Client(
+                limits=_limits(),
+                timeout=_timeout(),
+                event_hooks={"request": [pool_stats.on_request]},
+            )
+            # Retries are left to the rate-limit scheduler, which backs off for every session at once
+            client = _clients[api_key] = OpenAI(
+                api_key=api_key, http_client=http_client, timeout=_timeout(), max_retries=0,
+            )
+        return client
+
+
+
+def get_async_client(api_key=None):
+    """Return the process-wide AsyncOpenAI client for an API key, for the ASGI server"""
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    with _clients_lock:
+        client = _async_clients.get(api_key)
+        if client is None:
+            import httpx
+            from openai import AsyncOpenAI
+
+            http_client = httpx.AsyncClient(
+                limits=_limits(),
+                timeout=_timeout(),
+                event_hooks={"request": [pool_stats.on_request_async]},
+            )
+            client = _async_clients[api_key] = AsyncOpenAI(
+                api_key=api_key, http_client=http_client, timeout=_timeout(), max_retries=0,
+            )
+        return client
@@ -0,0 +1,221 @@
+"""
+Concurrent interview load generator.
+
+Simulates N candidates walking the full phase machine (introduction,
+resume review, coding with clarification/approach/code, conclusion)
+through the same turn handler the ASGI server uses, against a local
+mock LLM:
+
+    python loadtest.py --sessions 200 --mock --latency 0.4 --token-rate 40
+
+Add --rpm/--tpm/--error-rate to have the mock enforce rate limits and
+fail calls, exercising the scheduler's queueing and retries.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from interview import MAX_CHALLENGES
+from personas import PERSONAS
+from reply_classifier import classify_reply
+
+SAMPLE_RESUME = (
+    "Sam Rivera - Backend Engineer. Experience: built payment APIs in Python and Go, "
+    "migrated a monolith to Kubernetes. Projects: realtime chat in FastAPI with Redis pub/sub. "
+    "Skills: Python, Go, PostgreSQL, Docker. https://github.com/samrivera"
+)
+SAMPLE_CODE = """def max_sub_array(nums):
+    best = current = nums[0]
+    for n in nums[1:]:
+        current = max(n, current + n)
+        best = max(best, current)
+    return best"""
+
+
+def candidate_message(state):
+    """Scripted candidate reply for the current interview state"""
+    if state.phase == "introduction":
+        return "Sam here, I mostly build backend services in Python."
+    if state.phase == "resume_review":
+        if "ready_for_coding" in classify_reply(state.messages[-1]["content"]):
+            return "yes, let's go!"
+        return "The payments API was the hardest part because of idempotency."
+    if state.awaiting_clarification:
+        return "Quick question: can the array be empty?"
+    if state.awaiting_approach:
+        return "My approach is Kadane's algorithm with a running sum."
+    if state.awaiting_code:
+        return SAMPLE_CODE
+    # With or without a resume review, only wrap up once every challenge is scored
+    if state.challenge_count > MAX_CHALLENGES:
+        return "I think that's everything from me, let's wrap up."
+    return "Ready for the next challenge whenever you are."
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate bytes held by an object graph of dicts, lists, tuples and scalars"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, name), seen) for name in obj.__slots__ if hasattr(obj, name))
+    return size
+
+
+async def run_candidate(server, session_id, session, max_turns, results):
+    """Drive one session to the conclusion, recording per-turn timings"""
+    for _ in range(max_turns):
+        if session.state.phase == "conclusion":
+            results["completed"] += 1
+            return
+        message = candidate_message(session.state)
+        started = time.perf_counter()
+        first_token = None
+        async for frame in server.run_turn(session_id, session, message):
+            if first_token is None and frame.startswith("data:"):
+                first_token = time.perf_counter() - started
+            if frame.startswith("event: error"):
+                results["errors"] += 1
+                return
+            results["tokens"] += frame.startswith("data:")
+        results["turn_latency"].append(time.perf_counter() - started)
+        results["ttft"].append(first_token or 0.0)
+    if session.state.phase == "conclusion":
+        results["completed"] += 1
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock(latency, token_rate, rpm=0, tpm=0, error_rate=0.0):
+    """Start mock_llm.py in a subprocess and return (process, base_url)"""
+    port = free_port()
+    process = subprocess.Popen([
+        sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_llm.py"),
+        "--port", str(port), "--latency", str(latency), "--token-rate", str(token_rate),
+        "--rpm", str(rpm), "--tpm", str(tpm), "--error-rate", str(error_rate),
+    ])
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            break
+        except OSError:
+            time.sleep(0.1)
+    return process, f"http://127.0.0.1:{port}/v1"
+
+
+async def run(args):
+    # Import after OPENAI_BASE_URL is set so the shared client points at the mock
+    import server
+    from contacts import extract_contacts
+    from llm_client import pool_stats
+    from model_router import route_stats
+    from rate_limiter import get_scheduler
+    from resume_cache import content_hash
+
+    sessions = []
+    for i in range(args.sessions):
+        # Personas take turns, so one run exercises every variant of the engine
+        session = server.store.add(f"loadtest-{i}", server.Session(persona=args.personas[i % len(args.personas)]))
+        if args.resume:
+            session.state.resume_text = SAMPLE_RESUME
+            session.state.resume_hash = content_hash(SAMPLE_RESUME.encode())
+            session.state.resume_contacts = extract_contacts(SAMPLE_RESUME).to_dict()
+        sessions.append((f"loadtest-{i}", session))
+
+    results = {"turn_latency": [], "ttft": [], "tokens": 0, "errors": 0, "completed": 0}
+    semaphore = asyncio.Semaphore(args.concurrency or args.sessions)
+
+    async def limited(session_id, session):
+        async with semaphore:
+            await run_candidate(server, session_id, session, args.max_turns, results)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limited(session_id, session) for session_id, session in sessions))
+    elapsed = time.perf_counter() - started
+
+    memory = [deep_sizeof(session.state) for _, session in sessions]
+    turns = len(results["turn_latency"])
+    return {
+        "sessions": args.sessions,
+        "completed": results["completed"],
+        "errors": results["errors"],
+        "turns": turns,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_turns_per_s": round(turns / elapsed, 2) if elapsed else 0.0,
+        "throughput_tokens_per_s": round(results["tokens"] / elapsed, 2) if elapsed else 0.0,
+        "turn_latency_s": {f"p{p}": round(percentile(results["turn_latency"], p), 4) for p in (50, 95, 99)},
+        "ttft_s": {f"p{p}": round(percentile(results["ttft"], p), 4) for p in (50, 95, 99)},
+        "personas": {name: sum(1 for _, session in sessions if session.state.persona == name) for name in args.personas},
+        "routes": route_stats.snapshot(),
+        "scheduler": {key: round(value, 3) for key, value in get_scheduler().snapshot_stats().items()},
+        "connection_pool": pool_stats.snapshot(),
+        "session_bytes": {
+            "mean": round(sum(memory) / len(memory)) if memory else 0,
+            "max": max(memory, default=0),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent interviews against a mock LLM")
+    parser.add_argument("--sessions", type=int, default=50, help="number of simulated candidates")
+    parser.add_argument("--concurrency", type=int, default=0, help="max sessions in flight (default: all)")
+    parser.add_argument("--max-turns", type=int, default=20, help="give up on a session after this many turns")
+    parser.add_argument("--personas", nargs="+", default=["chill"], choices=sorted(PERSONAS),
+                        help="interviewer personas, assigned to sessions in turn")
+    parser.add_argument("--no-resume", dest="resume", action="store_false", help="skip the resume review phase")
+    parser.add_argument("--mock", action="store_true", help="start mock_llm.py instead of using OPENAI_BASE_URL")
+    parser.add_argument("--latency", type=float, default=0.3, help="mock time to first token (s)")
+    parser.add_argument("--token-rate", type=float, default=50, help="mock tokens per second")
+    parser.add_argument("--rpm", type=int, default=0, help="mock requests-per-minute limit (0: none)")
+    parser.add_argument("--tpm", type=int, default=0, help="mock tokens-per-minute limit (0: none)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of mock calls that fail with a 5xx")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    args = parser.parse_args()
+
+    process = None
+    if args.mock:
+        process, base_url = start_mock(args.latency, args.token_rate, args.rpm, args.tpm, args.error_rate)
+        os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "sk-loadtest")
+    # Simulated sessions are not worth keeping
+    os.environ.setdefault("SESSION_DB", ":memory:")
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print(json.dumps(report, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import bisect
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from llm_client import pool_stats
+from rate_limiter import get_scheduler
+
+# Histogram bucket bounds in seconds, from prompt assembly up to slow completions
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Rolling JSONL log of finished turns; unset to keep metrics in memory only
+METRICS_LOG = os.getenv("METRICS_LOG", "")
+METRICS_LOG_BYTES = int(os.getenv("METRICS_LOG_BYTES", str(10 * 1024 * 1024)))
+METRICS_LOG_BACKUPS = 3
+# Ask for a usage chunk at the end of streamed completions
+USAGE_OPTIONS = {"stream_options": {"include_usage": True}}
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """
+    Process-wide stage histograms and token counters.
+
+    Stage timings are keyed by (stage, phase) and tokens by (kind, phase,
+    route); `render` writes them in the Prometheus text format. Finished
+    turns can also go to a size-rotated JSONL file, one record per turn.
+    """
+
+    def __init__(self, log_path=METRICS_LOG):
+        self.stages = {}
+        self.tokens = {}
+        self.turns = {}
+        self._lock = threading.Lock()
+        self._log = _turn_logger(log_path) if log_path else None
+
+    def observe(self, stage, seconds, phase=""):
+        with self._lock:
+            histogram = self.stages.get((stage, phase))
+            if histogram is None:
+                histogram = self.stages[(stage, phase)] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage, phase=""):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, phase)
+
+    def record_turn(self, turn):
+        with self._lock:
+            self.turns[turn.phase] = self.turns.get(turn.phase, 0) + 1
+            for kind, count in turn.usage.items():
+                key = (kind, turn.phase, turn.route or "")
+                self.tokens[key] = self.tokens.get(key, 0) + count
+        for stage, seconds in turn.stages.items():
+            self.observe(stage, seconds, turn.phase)
+        if self._log is not None:
+            self._log.info(json.dumps(turn.record()))
+
+    def render(self):
+        """Prometheus text exposition of everything recorded so far"""
+        with self._lock:
+            stages = {key: (list(h.counts), h.sum, h.count) for key, h in self.stages.items()}
+            tokens = dict(self.tokens)
+            turns = dict(self.turns)
+        lines = [
+            "# HELP recrewai_turns_total Interview turns finished, by the phase they started in",
+            "# TYPE recrewai_turns_total counter",
+        ]
+        lines += [f'recrewai_turns_total{{phase="{phase}"}} {count}' for phase, count in sorted(turns.items())]
+        lines += [
+            "# HELP recrewai_stage_seconds Time spent in each stage of an interview turn",
+            "# TYPE recrewai_stage_seconds histogram",
+        ]
+        for (stage, phase), (counts, total, count) in sorted(stages.items()):
+            labels = f'stage="{stage}",phase="{phase}"'
+            cumulative = 0
+            for bound, bucket in zip(BUCKETS, counts):
+                cumulative += bucket
+                lines.append(f'recrewai_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'recrewai_stage_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"recrewai_stage_seconds_sum{{{labels}}} {total:.6f}")
+            lines.append(f"recrewai_stage_seconds_count{{{labels}}} {count}")
+        lines += [
+            "# HELP recrewai_tokens_total Prompt and completion tokens reported by the API",
+            "# TYPE recrewai_tokens_total counter",
+        ]
+        lines += [
+            f'recrewai_tokens_total{{kind="{kind}",phase="{phase}",route="{route}"}} {count}'
+            for (kind, phase, route), count in sorted(tokens.items())
+        ]
+        # Keep-alive reuse of the shared OpenAI connection pool (llm_client.py)
+        pool = pool_stats.snapshot()
+        lines += [
+            "# HELP recrewai_llm_requests_total Requests sent through the shared OpenAI connection pool",
+            "# TYPE recrewai_llm_requests_total counter",
+            f"recrewai_llm_requests_total {pool['requests']}",
+            "# HELP recrewai_llm_connections_total New TCP connections opened by the pool",
+            "# TYPE recrewai_llm_connections_total counter",
+            f"recrewai_llm_connections_total {pool['connections']}",
+            "# HELP recrewai_llm_tls_handshakes_total TLS handshakes done by the pool",
+            "# TYPE recrewai_llm_tls_handshakes_total counter",
+            f"recrewai_llm_tls_handshakes_total {pool['tls_handshakes']}",
+            "# HELP recrewai_llm_connection_reuse_ratio Share of requests sent on an already open connection",
+            "# TYPE recrewai_llm_connection_reuse_ratio gauge",
+            f"recrewai_llm_connection_reuse_ratio {pool['reuse_ratio']}",
+        ]
+        # Rate-limit scheduler counters (rate_limiter.py)
+        scheduler = get_scheduler().snapshot_stats()
+        lines += [
+            "# HELP recrewai_llm_scheduler_total Chat completion calls, retries and errors seen by the rate-limit scheduler",
+            "# TYPE recrewai_llm_scheduler_total counter",
+        ]
+        lines += [
+            f'recrewai_llm_scheduler_total{{kind="{kind}"}} {scheduler[kind]}'
+            for kind in ("calls", "retries", "rate_limited", "server_errors")
+        ]
+        lines += [
+            "# HELP recrewai_llm_queued_seconds_total Time calls spent waiting for the rate-limit scheduler",
+            "# TYPE recrewai_llm_queued_seconds_total counter",
+            f"recrewai_llm_queued_seconds_total {scheduler['queued_s']:.6f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class TurnMetrics:
+    """Stage timings and token usage of one interview turn"""
+
+    def __init__(self, phase, route=None):
+        self.phase = phase
+        self.route = route
+        self.stages = {}
+        self.usage = {}
+        self.started = time.time()
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def _chunk(self, chunk, requested):
+        if "llm_ttft" not in self.stages and chunk.choices:
+            delta = chunk.choices[0].delta
+            if delta.content or delta.tool_calls:
+                self.stages["llm_ttft"] = time.perf_counter() - requested
+        if getattr(chunk, "usage", None):
+            self.usage = {"prompt": chunk.usage.prompt_tokens, "completion": chunk.usage.completion_tokens}
+
+    def watch(self, stream, requested):
+        """Pass a completion stream through, timing the first token and the whole call and keeping `usage`"""
+        for chunk in stream:
+            self._chunk(chunk, requested)
+            yield chunk
+        self.stages["llm_total"] = time.perf_counter() - requested
+
+    async def awatch(self, stream, requested):
+        async for chunk in stream:
+            self._chunk(chunk, requested)
+            yield chunk
+        self.stages["llm_total"] = time.perf_counter() - requested
+
+    def record(self):
+        return {
+            "ts": round(self.started, 3),
+            "phase": self.phase,
+            "route": self.route,
+            "stages": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            "tokens": self.usage,
+        }
+
+    def finish(self):
+        get_metrics().record_turn(self)
+
+
+def _turn_logger(path):
+    logger = logging.getLogger(f"{__name__}.turns")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = logging.handlers.RotatingFileHandler(path, maxBytes=METRICS_LOG_BYTES, backupCount=METRICS_LOG_BACKUPS)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    """Return the process-wide metrics registry"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+        return _metrics
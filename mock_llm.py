@@ -0,0 +1,225 @@
+"""
+Local OpenAI-compatible chat completions server for load testing.
+
+Replies are canned and picked from the candidate's last message so that a
+scripted interview hits every phase transition the apps look for. Run:
+
+    python mock_llm.py --port 8100 --latency 0.4 --token-rate 40
+
+and point the apps at it with OPENAI_BASE_URL=http://127.0.0.1:8100/v1.
+
+--rpm/--tpm enforce per-minute limits the way the real API does: every
+response carries x-ratelimit-* headers and calls over the limit get a 429
+with retry-after-ms. --error-rate answers that share of calls with a 5xx.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+# (marker in the candidate's message, reply), checked in order
+CANNED_REPLIES = [
+    ("def ", "Correctness: ✅ correct and optimal, handles all negatives. Complexity is O(n) time, O(1) space. Score: 28/33"),
+    ("approach", "✅ That’s sharp, nice use of a running sum! ✅ Awesome—code it up!"),
+    ("wrap up", "You rocked this! Here’s the rundown: 84/100. Correctness (40/45), Complexity (26/30), Chat (18/24). That’s a wrap—thanks for chilling with me!"),
+    ("question", "✅ Good one! Here’s the deal: nums always has at least one element. Any quick questions to sort this out?"),
+    ("yes", "Cool! Here’s your first coding challenge: find the contiguous subarray with the largest sum."),
+]
+# Subscores returned when a request forces the evaluation tool
+MOCK_EVALUATION = {"correctness": 13, "complexity": 9, "clarity": 6, "verdict": "pass", "next_difficulty": "HARD"}
+DEFAULT_REPLY = "✅ Love that! Got a project you’re stoked about? What was the hard part? Ready to jump into some coding?"
+
+config = {
+    "latency": float(os.getenv("MOCK_LATENCY", "0.3")),
+    "token_rate": float(os.getenv("MOCK_TOKEN_RATE", "50")),
+    "rpm": int(os.getenv("MOCK_RPM", "0")),  # 0: no limit
+    "tpm": int(os.getenv("MOCK_TPM", "0")),
+    "error_rate": float(os.getenv("MOCK_ERROR_RATE", "0")),
+}
+# kind -> [tokens left, last refill time]; buckets refill continuously over a minute
+buckets = {}
+buckets_lock = threading.Lock()
+
+
+def pick_reply(messages):
+    """Choose the canned reply for the last user message"""
+    user_messages = [msg["content"] for msg in messages if msg["role"] == "user"]
+    last = user_messages[-1].lower() if user_messages else ""
+    for marker, reply in CANNED_REPLIES:
+        if marker in last:
+            return reply
+    return DEFAULT_REPLY
+
+
+def tokenize(text):
+    """Split a reply into word-sized pieces that rejoin to the original text"""
+    words = text.split(" ")
+    return [word + " " for word in words[:-1]] + [words[-1]]
+
+
+def tool_arguments(body, reply):
+    """JSON arguments for the forced tool call, or None if the request doesn't force one"""
+    choice = body.get("tool_choice")
+    if not body.get("tools") or not isinstance(choice, dict):
+        return None
+    return json.dumps({"feedback": reply, **MOCK_EVALUATION})
+
+
+def tool_call(name, arguments, first=True):
+    call = {"index": 0, "function": {"arguments": arguments}}
+    if first:
+        call.update(id="call_mock", type="function")
+        call["function"]["name"] = name
+    return call
+
+
+def rate_limit(prompt_tokens, max_tokens):
+    """
+    Charge one call against the rpm/tpm buckets.
+    Returns (headers, seconds to wait or 0 if the call may proceed).
+    """
+    headers, wait = {}, 0.0
+    costs = {"requests": (config["rpm"], 1), "tokens": (config["tpm"], prompt_tokens + max_tokens)}
+    now = time.monotonic()
+    with buckets_lock:
+        levels = {}
+        for kind, (limit, cost) in costs.items():
+            if not limit:
+                continue
+            level, updated = buckets.get(kind, [limit, now])
+            level = min(limit, level + (now - updated) * limit / 60)
+            buckets[kind] = [level, now]
+            levels[kind] = level
+            if level < cost:
+                wait = max(wait, (cost - level) * 60 / limit)
+        for kind, level in levels.items():
+            limit, cost = costs[kind]
+            if not wait:
+                level -= cost
+                buckets[kind][0] = level
+            headers[f"x-ratelimit-limit-{kind}"] = str(limit)
+            headers[f"x-ratelimit-remaining-{kind}"] = str(max(0, int(level)))
+            headers[f"x-ratelimit-reset-{kind}"] = f"{(limit - level) * 60 / limit:.3f}s"
+    if wait:
+        headers["retry-after-ms"] = str(int(wait * 1000) + 1)
+    return headers, wait
+
+
+def usage(messages, completion_tokens):
+    prompt_tokens = sum(len(msg["content"]) // 4 + 4 for msg in messages)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def chunk(model, delta, finish_reason=None):
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+async def stream_reply(body, reply):
+    model = body.get("model", "mock")
+    tokens = tokenize(reply)
+    arguments = tool_arguments(body, reply)
+    await asyncio.sleep(config["latency"])
+    if arguments is None:
+        yield f"data: {json.dumps(chunk(model, {'role': 'assistant', 'content': ''}))}\n\n"
+        deltas = [{"content": token} for token in tokens]
+        finish_reason = "stop"
+    else:
+        # Stream the arguments in pieces of about one token each
+        name = body["tool_choice"]["function"]["name"]
+        size = max(1, len(arguments) // max(1, len(tokens)))
+        pieces = [arguments[i:i + size] for i in range(0, len(arguments), size)]
+        deltas = [{"role": "assistant", "tool_calls": [tool_call(name, "")]}]
+        deltas += [{"tool_calls": [tool_call(name, piece, first=False)]} for piece in pieces]
+        finish_reason = "tool_calls"
+    for delta in deltas:
+        yield f"data: {json.dumps(chunk(model, delta))}\n\n"
+        if config["token_rate"] > 0:
+            await asyncio.sleep(1 / config["token_rate"])
+    yield f"data: {json.dumps(chunk(model, {}, finish_reason))}\n\n"
+    if (body.get("stream_options") or {}).get("include_usage"):
+        final = chunk(model, {})
+        final["choices"] = []
+        final["usage"] = usage(body["messages"], len(tokens))
+        yield f"data: {json.dumps(final)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def error(status, message, kind, headers=None):
+    return JSONResponse({"error": {"message": message, "type": kind, "code": None}}, status_code=status, headers=headers)
+
+
+async def chat_completions(request):
+    body = await request.json()
+    if config["error_rate"] and random.random() < config["error_rate"]:
+        return error(random.choice([500, 502, 503]), "The server had an error while processing your request.",
+                     "server_error")
+    prompt_tokens = usage(body["messages"], 0)["prompt_tokens"]
+    headers, wait = rate_limit(prompt_tokens, body.get("max_tokens") or 0)
+    if wait:
+        return error(429, f"Rate limit reached; please try again in {wait:.3f}s.", "rate_limit_exceeded", headers)
+
+    reply = pick_reply(body["messages"])
+    if body.get("stream"):
+        return StreamingResponse(stream_reply(body, reply), media_type="text/event-stream", headers=headers)
+
+    tokens = tokenize(reply)
+    await asyncio.sleep(config["latency"] + (len(tokens) / config["token_rate"] if config["token_rate"] > 0 else 0))
+    message = {"role": "assistant", "content": reply}
+    arguments = tool_arguments(body, reply)
+    if arguments is not None:
+        call = tool_call(body["tool_choice"]["function"]["name"], arguments)
+        del call["index"]
+        message = {"role": "assistant", "content": None, "tool_calls": [call]}
+    return JSONResponse({
+        "id": "chatcmpl-mock",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{"index": 0, "message": message, "finish_reason": "stop" if arguments is None else "tool_calls"}],
+        "usage": usage(body["messages"], len(tokens)),
+    }, headers=headers)
+
+
+app = Starlette(routes=[Route("/v1/chat/completions", chat_completions, methods=["POST"])])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock OpenAI chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=config["latency"], help="seconds before the first token")
+    parser.add_argument("--token-rate", type=float, default=config["token_rate"], help="tokens per second; 0 for no delay")
+    parser.add_argument("--rpm", type=int, default=config["rpm"], help="requests per minute before 429s; 0 for no limit")
+    parser.add_argument("--tpm", type=int, default=config["tpm"], help="tokens per minute before 429s; 0 for no limit")
+    parser.add_argument("--error-rate", type=float, default=config["error_rate"], help="share of calls answered with a 5xx")
+    args = parser.parse_args()
+    config["latency"] = args.latency
+    config["token_rate"] = args.token_rate
+    config["rpm"] = args.rpm
+    config["tpm"] = args.tpm
+    config["error_rate"] = args.error_rate
+
+    import uvicorn
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
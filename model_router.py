@@ -0,0 +1,68 @@
+import logging
+import os
+import threading
+
+from reply_classifier import classify_input
+
+logger = logging.getLogger(__name__)
+
+# Fast model for conversational turns, strong model where the answer is judged or summed up
+LIGHT_MODEL = os.getenv("LIGHT_MODEL", "gpt-4o-mini")
+HEAVY_MODEL = os.getenv("HEAVY_MODEL", "gpt-4")
+
+# Completion arguments per route; the output caps bound the latency of each kind of turn
+ROUTES = {
+    "chat": {"model": LIGHT_MODEL, "max_tokens": 200},  # Greetings, resume questions, clarifications
+    "coding": {"model": LIGHT_MODEL, "max_tokens": 350},  # Approach talk and hints between submissions
+    "review": {"model": HEAVY_MODEL, "max_tokens": 500},  # Code evaluation
+    "rundown": {"model": HEAVY_MODEL, "max_tokens": 500},  # Final scores and feedback
+    "problem": {"model": HEAVY_MODEL, "max_tokens": 400},  # New problems once the bank runs out
+}
+
+
+def looks_like_code(text):
+    return "```" in text or "def " in text or "class " in text
+
+
+def choose_route(state, max_challenges=3):
+    """
+    Pick the route for the next reply from st.session_state or an InterviewState.
+    Apps without the awaiting_* flags fall back to spotting code in the message.
+    """
+    phase = state.get("phase")
+    last = state.messages[-1]["content"] if len(state.messages) else ""
+    if phase == "coding" and (state.get("awaiting_code") or looks_like_code(last)):
+        name = "review"
+    elif (phase == "conclusion" or "wrap_up" in classify_input(last)
+          or (phase == "coding" and state.get("challenge_count", 0) > max_challenges)):
+        name = "rundown"
+    elif phase == "coding" and not state.get("awaiting_clarification"):
+        name = "coding"
+    else:
+        name = "chat"
+    logger.debug("phase=%s challenge=%s -> route %s", phase, state.get("challenge_count"), name)
+    return name
+
+
+class RouteStats:
+    """Calls and latency per route, so the split between models can be tuned"""
+
+    def __init__(self):
+        self.routes = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, seconds):
+        with self._lock:
+            calls, total, worst = self.routes.get(route, (0, 0.0, 0.0))
+            self.routes[route] = (calls + 1, total + seconds, max(worst, seconds))
+        logger.info("route=%s model=%s latency=%.3fs", route, ROUTES[route]["model"], seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                route: {"calls": calls, "avg_s": round(total / calls, 4), "max_s": round(worst, 4)}
+                for route, (calls, total, worst) in self.routes.items()
+            }
+
+
+route_stats = RouteStats()
@@ -0,0 +1,274 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from model_router import ROUTES, route_stats
+from rate_limiter import BACKGROUND_PRIORITY, get_scheduler
+
+DIFFICULTIES = ("EASY", "MEDIUM", "HARD")
+
+# Problems with a "function" and "tests" are checked by running the submission
+# (restricted_env.py) and a "profile" measures its growth up to the stated
+# constraint (complexity.py); the rest are judged by the model alone.
+PROBLEMS = [
+    {
+        "title": "Two Sum",
+        "difficulty": "EASY",
+        "domain": "Hashing",
+        "statement": "Write two_sum(nums, target). Given an integer array nums and an integer target, return the indices of the two numbers that add up to target. Constraints: 2 <= nums.length <= 10^4, -10^9 <= nums[i], target <= 10^9, exactly one answer exists. Edge cases: duplicate values, negative numbers.",
+        "function": "two_sum",
+        "profile": {"input": "two_sum", "max_n": 10000, "optimal": "O(n)"},
+        "tests": [
+            {"args": [[2, 7, 11, 15], 9], "expected": [0, 1], "unordered": True},
+            {"args": [[3, 2, 4], 6], "expected": [1, 2], "unordered": True},
+            {"args": [[3, 3], 6], "expected": [0, 1], "unordered": True},
+            {"args": [[-1, -2, -3, -4, -5], -8], "expected": [2, 4], "unordered": True},
+        ],
+    },
+    {
+        "title": "Valid Parentheses",
+        "difficulty": "EASY",
+        "domain": "Stacks",
+        "statement": "Write is_valid(s). Given a string s containing only the characters ()[]{}, decide whether every bracket is closed by the same type in the correct order. Constraints: 1 <= s.length <= 10^4. Edge cases: a lone closing bracket, unmatched openers at the end.",
+        "function": "is_valid",
+        "profile": {"input": "brackets", "max_n": 10000, "optimal": "O(n)"},
+        "tests": [
+            {"args": ["()[]{}"], "expected": True},
+            {"args": ["([{}])"], "expected": True},
+            {"args": ["(]"], "expected": False},
+            {"args": ["]"], "expected": False},
+            {"args": ["(("], "expected": False},
+        ],
+    },
+    {
+        "title": "Maximum Depth of Binary Tree",
+        "difficulty": "EASY",
+        "domain": "Trees",
+        "statement": "Given the root of a binary tree, return its maximum depth: the number of nodes on the longest root-to-leaf path. Constraints: 0 <= number of nodes <= 10^4. Edge cases: empty tree, a tree that is a single long chain.",
+    },
+    {
+        "title": "Maximum Subarray",
+        "difficulty": "MEDIUM",
+        "domain": "Dynamic Programming",
+        "statement": "Write max_sub_array(nums). Given an integer array nums, find the contiguous subarray with the largest sum. Constraints: 1 <= nums.length <= 3 * 10^4, -10^5 <= nums[i] <= 10^5. Edge cases: all negatives, all positives.",
+        "function": "max_sub_array",
+        "profile": {"input": "int_array", "max_n": 30000, "optimal": "O(n)"},
+        "tests": [
+            {"args": [[-2, 1, -3, 4, -1, 2, 1, -5, 4]], "expected": 6},
+            {"args": [[1]], "expected": 1},
+            {"args": [[-3, -1, -2]], "expected": -1},
+            {"args": [[5, 4, -1, 7, 8]], "expected": 23},
+        ],
+    },
+    {
+        "title": "Number of Islands",
+        "difficulty": "MEDIUM",
+        "domain": "Graph Algorithms",
+        "statement": "Write num_islands(grid). Given an m x n grid of '1' (land) and '0' (water), count the islands, where an island is land connected horizontally or vertically. Constraints: 1 <= m, n <= 300. Edge cases: all water, one island covering the grid.",
+        "function": "num_islands",
+        "profile": {"input": "grid", "max_n": 90000, "optimal": "O(n)"},
+        "tests": [
+            {"args": [[["1", "1", "0"], ["1", "0", "0"], ["0", "0", "1"]]], "expected": 2},
+            {"args": [[["0", "0"], ["0", "0"]]], "expected": 0},
+            {"args": [[["1", "1"], ["1", "1"]]], "expected": 1},
+            {"args": [[["1", "0", "1", "0", "1"]]], "expected": 3},
+        ],
+    },
+    {
+        "title": "Longest Substring Without Repeating Characters",
+        "difficulty": "MEDIUM",
+        "domain": "Sliding Window",
+        "statement": "Write length_of_longest_substring(s). Given a string s, return the length of the longest substring without repeating characters. Constraints: 0 <= s.length <= 5 * 10^4, s holds letters, digits, symbols and spaces. Edge cases: empty string, all characters the same.",
+        "function": "length_of_longest_substring",
+        "profile": {"input": "text", "max_n": 50000, "optimal": "O(n)"},
+        "tests": [
+            {"args": ["abcabcbb"], "expected": 3},
+            {"args": ["bbbbb"], "expected": 1},
+            {"args": ["pwwkew"], "expected": 3},
+            {"args": [""], "expected": 0},
+            {"args": ["dvdf"], "expected": 3},
+        ],
+    },
+    {
+        "title": "Lowest Common Ancestor of a Binary Tree",
+        "difficulty": "MEDIUM",
+        "domain": "Trees",
+        "statement": "Given a binary tree and two of its nodes p and q, return their lowest common ancestor. Constraints: 2 <= number of nodes <= 10^5, all values unique, p and q exist. Edge cases: p is an ancestor of q, p and q are siblings.",
+    },
+    {
+        "title": "Edit Distance",
+        "difficulty": "HARD",
+        "domain": "Dynamic Programming",
+        "statement": "Write min_distance(word1, word2). Given two strings word1 and word2, return the minimum number of single-character inserts, deletes and replaces that turn word1 into word2. Constraints: 0 <= word1.length, word2.length <= 500. Edge cases: one empty string, identical strings.",
+        "function": "min_distance",
+        "profile": {"input": "word_pair", "max_n": 500, "optimal": "O(n^2)"},
+        "tests": [
+            {"args": ["horse", "ros"], "expected": 3},
+            {"args": ["intention", "execution"], "expected": 5},
+            {"args": ["", "abc"], "expected": 3},
+            {"args": ["same", "same"], "expected": 0},
+        ],
+    },
+    {
+        "title": "Word Ladder",
+        "difficulty": "HARD",
+        "domain": "Graph Algorithms",
+        "statement": "Write ladder_length(begin_word, end_word, word_list). Given beginWord, endWord and a wordList, return the number of words in the shortest transformation sequence from beginWord to endWord, changing one letter at a time and only through words in the list; return 0 if none exists. Constraints: 1 <= wordList.length <= 5000, all words have the same length <= 10. Edge cases: endWord missing from the list, beginWord equal to endWord.",
+        "function": "ladder_length",
+        "profile": {"input": "word_list", "max_n": 5000, "optimal": "O(n)"},
+        "tests": [
+            {"args": ["hit", "cog", ["hot", "dot", "dog", "lot", "log", "cog"]], "expected": 5},
+            {"args": ["hit", "cog", ["hot", "dot", "dog", "lot", "log"]], "expected": 0},
+            {"args": ["a", "c", ["a", "b", "c"]], "expected": 2},
+        ],
+    },
+    {
+        "title": "Sliding Window Maximum",
+        "difficulty": "HARD",
+        "domain": "Optimized Space-Time Tradeoffs",
+        "statement": "Write max_sliding_window(nums, k). Given an integer array nums and a window size k, return the maximum of every contiguous window of size k as it slides from left to right. Constraints: 1 <= k <= nums.length <= 10^5, -10^4 <= nums[i] <= 10^4. Edge cases: k = 1, k = nums.length, strictly decreasing input. Target O(n) time.",
+        "function": "max_sliding_window",
+        "profile": {"input": "window", "max_n": 100000, "optimal": "O(n)"},
+        "tests": [
+            {"args": [[1, 3, -1, -3, 5, 3, 6, 7], 3], "expected": [3, 3, 5, 5, 6, 7]},
+            {"args": [[1], 1], "expected": [1]},
+            {"args": [[9, 8, 7, 6], 2], "expected": [9, 8, 7]},
+            {"args": [[4, 2], 2], "expected": [4]},
+        ],
+    },
+    {
+        "title": "Serialize and Deserialize Binary Tree",
+        "difficulty": "HARD",
+        "domain": "Trees",
+        "statement": "Design encode(root) -> str and decode(str) -> root so that any binary tree round-trips exactly. Constraints: 0 <= number of nodes <= 10^4, -1000 <= node values <= 1000. Edge cases: empty tree, fully skewed tree, negative values.",
+    },
+]
+
+GENERATE_PROMPT = (
+    "Write one {difficulty} LeetCode-style coding interview problem that is not any of: {seen}. "
+    'Reply with only a JSON object with keys "title", "domain" and "statement"; the statement '
+    "must include clear constraints and edge cases."
+)
+
+
+def generate_problem(difficulty, seen=()):
+    """Ask the model for a fresh problem once the bank has none left at a difficulty"""
+    from llm_client import get_client
+
+    started = time.perf_counter()
+    # Same rate limits and retries as the interview turns, queued behind them
+    response = get_scheduler().create(
+        get_client(),
+        session="problem-bank",
+        priority=BACKGROUND_PRIORITY,
+        messages=[{"role": "user", "content": GENERATE_PROMPT.format(difficulty=difficulty, seen=", ".join(seen) or "none")}],
+        temperature=0.8,
+        **ROUTES["problem"],
+    )
+    route_stats.record("problem", time.perf_counter() - started)
+    data = json.loads(response.choices[0].message.content)
+    return {
+        "title": str(data["title"]),
+        "difficulty": difficulty,
+        "domain": str(data.get("domain") or "General"),
+        "statement": str(data["statement"]),
+    }
+
+
+class ProblemBank:
+    """
+    Coding problems indexed by difficulty and domain.
+
+    `pick` prefers a domain the candidate hasn't seen yet; with
+    `generate`, it calls the model once every problem at that difficulty
+    has been used. `prefetch` gets the next problem for every difficulty
+    ready on a background worker while the candidate is still coding, and
+    is the only caller that generates: `next` never waits, so it returns
+    as soon as the score is in, whichever way the difficulty moved.
+    """
+
+    def __init__(self, problems=PROBLEMS, generate=generate_problem, max_pending=256):
+        self.generate = generate
+        self.max_pending = max_pending
+        self._index = {difficulty: OrderedDict() for difficulty in DIFFICULTIES}
+        self._by_title = {}
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+        for problem in problems:
+            self.add(problem)
+
+    def add(self, problem):
+        with self._lock:
+            self._index[problem["difficulty"]].setdefault(problem["domain"], []).append(problem)
+            self._by_title[problem["title"]] = problem
+
+    def get(self, title):
+        """Return the problem with this title, or None"""
+        with self._lock:
+            return self._by_title.get(title)
+
+    def pick(self, difficulty, seen=(), generate=False):
+        """Return a problem at `difficulty` whose title isn't in `seen`, generating one if allowed and needed"""
+        seen = set(seen)
+        with self._lock:
+            seen_domains = {self._by_title[title]["domain"] for title in seen if title in self._by_title}
+            unseen = [
+                problem
+                for problems in self._index[difficulty].values()
+                for problem in problems
+                if problem["title"] not in seen
+            ]
+        if unseen:
+            # Stable order, so a prefetched pick matches what `pick` would return now
+            return min(unseen, key=lambda problem: problem["domain"] in seen_domains)
+        if generate and self.generate is not None:
+            try:
+                problem = self.generate(difficulty, sorted(seen))
+                self.add(problem)
+                return problem
+            except Exception:
+                pass
+        # Out of problems and nothing generated yet: repeat one rather than stall
+        with self._lock:
+            return next(problem for problems in self._index[difficulty].values() for problem in problems)
+
+    def prefetch(self, seen=()):
+        """Start getting the next problem for every difficulty in the background"""
+        seen = frozenset(seen)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="problem-prefetch")
+            for difficulty in DIFFICULTIES:
+                key = (difficulty, seen)
+                if key not in self._pending:
+                    self._pending[key] = self._executor.submit(self.pick, difficulty, seen, True)
+            while len(self._pending) > self.max_pending:
+                self._pending.popitem(last=False)
+
+    def next(self, difficulty, seen=()):
+        """
+        Return the prefetched problem for `difficulty` if it is ready, else
+        pick one from the bank now; never waits on the model
+        """
+        with self._lock:
+            future = self._pending.pop((difficulty, frozenset(seen)), None)
+        if future is not None and future.done() and future.exception() is None:
+            return future.result()
+        # A prefetch still generating goes on; its problem joins the bank for later picks
+        return self.pick(difficulty, seen)
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_problem_bank():
+    """Return the process-wide problem bank"""
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            _bank = ProblemBank()
+        return _bank
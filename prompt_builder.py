@@ -0,0 +1,60 @@
+import threading
+
+from context_window import PROMPT_TOKEN_BUDGET, build_window
+
+RESUME_PLACEHOLDER = "{resume_text}"
+RESUME_REFERENCE = "(the relevant resume sections are given in the interview state note at the end of the conversation)"
+
+
+def state_note(phase, difficulty=None, resume_excerpt=None, test_results=None, complexity=None, attempts_left=None):
+    """Build the trailing system message that carries per-turn interview state"""
+    lines = [f"Interview state note. Current phase: {phase}"]
+    if difficulty:
+        lines.append(f"Current difficulty level: {difficulty}")
+    if resume_excerpt:
+        lines.append(f"Resume sections relevant to this turn:\n{resume_excerpt}")
+    if test_results:
+        lines.append(f"Local test results for the submitted code (base correctness on these):\n{test_results}")
+    if complexity:
+        lines.append(f"Measured complexity of the submitted code (skip Big-O follow-ups if it meets the target):\n{complexity}")
+    if attempts_left is not None:
+        lines.append(f"Attempts left on this challenge, counting this submission: {attempts_left}")
+    return {"role": "system", "content": "\n".join(lines)}
+
+
+class PromptAssembler:
+    """
+    Build chat payloads whose leading system message is byte-stable.
+
+    The persona's prompt template is rendered once with the resume
+    placeholder pointing at the state note, so every turn, phase and
+    candidate of a persona sends the same prefix and provider-side prompt
+    caching can reuse it. Candidate data (resume sections) and other
+    volatile state go in the trailing state note instead.
+    """
+
+    def __init__(self, persona, template):
+        self.persona = persona
+        self.template = template
+        self._prefix = {"role": "system", "content": template.replace(RESUME_PLACEHOLDER, RESUME_REFERENCE)}
+
+    def prefix(self):
+        """Return the rendered system message"""
+        return self._prefix
+
+    def build(self, history, summaries, note, budget=PROMPT_TOKEN_BUDGET):
+        """Assemble the messages for one request: prefix, summaries, window, state note"""
+        return build_window([self._prefix], history, summaries, budget, trailing=[note])
+
+
+_assemblers = {}
+_assemblers_lock = threading.Lock()
+
+
+def get_assembler(persona, template):
+    """Return the process-wide assembler for a persona's prompt template"""
+    with _assemblers_lock:
+        assembler = _assemblers.get(persona)
+        if assembler is None or assembler.template != template:
+            assembler = _assemblers[persona] = PromptAssembler(persona, template)
+        return assembler
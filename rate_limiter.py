@@ -0,0 +1,317 @@
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import re
+import threading
+import time
+
+from context_window import count_message_tokens
+
+# Starting guesses for the org's limits (0: unknown, don't throttle); response headers replace them
+REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_RPM", "0"))
+TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TPM", "0"))
+MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 20.0
+# Completion tokens reserved for a call that doesn't set max_tokens
+DEFAULT_COMPLETION_TOKENS = 500
+# Waiters re-check at least this often, in case a wakeup was missed
+MAX_WAIT = 1.0
+
+# Lower runs first: turns of interviews already under way go before first replies,
+# and both go before background work such as generating problems ahead of time
+TURN_PRIORITY = 0
+GREETING_PRIORITY = 1
+BACKGROUND_PRIORITY = 2
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(value):
+    """Seconds in a rate-limit reset header such as "1s", "6m0s" or "20ms"; None if unreadable"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION.findall(value)
+    return sum(float(amount) * _UNITS[unit] for amount, unit in parts) if parts else None
+
+
+def estimate_tokens(kwargs):
+    """Tokens a chat completion call will count against the TPM limit"""
+    prompt = sum(count_message_tokens(message) for message in kwargs.get("messages", ()))
+    return prompt + (kwargs.get("max_tokens") or DEFAULT_COMPLETION_TOKENS)
+
+
+class TokenBucket:
+    """A per-minute allowance that refills continuously; a capacity of 0 means no limit is known"""
+
+    def __init__(self, capacity, period=60.0):
+        self.capacity = capacity
+        self.period = period
+        self.level = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        if not self.capacity:
+            return
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / self.period)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Seconds until `amount` is available; calls larger than the bucket wait for a full one"""
+        self._refill(now)
+        if not self.capacity:
+            return 0.0
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing * self.period / self.capacity)
+
+    def take(self, amount, now):
+        self._refill(now)
+        self.level -= amount
+
+    def sync(self, limit, remaining, reset, now):
+        """Adopt the server's view from x-ratelimit-* headers"""
+        self._refill(now)
+        if limit:
+            if not self.capacity:
+                self.level = float(limit)
+            self.capacity = limit
+        if remaining is not None:
+            # Calls still in flight when the header was written may not be counted yet
+            self.level = min(self.level, remaining)
+        if reset and remaining is not None and limit and limit > remaining:
+            # Refill at the rate that makes the bucket full at the reset time
+            self.period = reset * limit / (limit - remaining)
+
+
+class _Ticket:
+    __slots__ = ("key", "cost", "event", "loop")
+
+    def __init__(self, key, cost, event, loop=None):
+        self.key = key
+        self.cost = cost
+        self.event = event
+        self.loop = loop
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+    def wake(self):
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self.event.set)
+
+
+class RateLimitScheduler:
+    """
+    Process-wide gate in front of chat completion calls.
+
+    Every call waits for room in two token buckets, one for requests and
+    one for tokens (prompt estimate plus max_tokens), that start from the
+    configured limits and follow the x-ratelimit-* headers of each
+    response. Waiting calls are served by priority, then by start-time
+    fair queuing across sessions, so a burst from one session can't starve
+    the others. 429s, 5xx and connection errors are retried with full
+    jitter backoff, honouring retry-after; a 429 also pauses every caller,
+    since the limit is shared by the whole org.
+    """
+
+    def __init__(self, requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE,
+                 max_retries=MAX_RETRIES):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.paused_until = 0.0
+        self.stats = {"calls": 0, "retries": 0, "rate_limited": 0, "server_errors": 0, "queued_s": 0.0}
+        self._queue = []
+        self._seq = itertools.count()
+        self._vtime = 0.0  # Virtual start time of the last call let through
+        self._finish = {}  # session -> virtual finish time of its last queued call
+        self._lock = threading.Lock()
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def snapshot_stats(self):
+        """A consistent copy of the counters, safe to read while calls are in flight"""
+        with self._lock:
+            return dict(self.stats)
+
+    def _enqueue(self, session, priority, cost, event, loop=None):
+        with self._lock:
+            start = max(self._vtime, self._finish.get(session, 0.0))
+            self._finish[session] = start + cost
+            if len(self._finish) > 4096:
+                # Sessions that are caught up carry no state worth keeping
+                self._finish = {key: value for key, value in self._finish.items() if value > self._vtime}
+            ticket = _Ticket((priority, start, next(self._seq)), cost, event, loop)
+            heapq.heappush(self._queue, ticket)
+            return ticket
+
+    def _try_grant(self, ticket):
+        """Let the ticket through if it is next and the buckets allow it; else seconds to wait (None: not next)"""
+        with self._lock:
+            if self._queue[0] is not ticket:
+                return None
+            now = time.monotonic()
+            wait = max(self.paused_until - now, self.requests.wait_time(1, now), self.tokens.wait_time(ticket.cost, now))
+            if wait > 0:
+                return wait
+            heapq.heappop(self._queue)
+            self.requests.take(1, now)
+            self.tokens.take(ticket.cost, now)
+            self._vtime = max(self._vtime, ticket.key[1])
+            if self._queue:
+                self._queue[0].wake()
+            return 0.0
+
+    def _cancel(self, ticket):
+        """Drop a waiter that gave up (e.g. a disconnected client) so it doesn't block the queue"""
+        with self._lock:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                if self._queue:
+                    self._queue[0].wake()
+
+    def acquire(self, session=None, priority=TURN_PRIORITY, cost=1):
+        """Block until a call of `cost` tokens may go out"""
+        started = time.monotonic()
+        ticket = self._enqueue(session, priority, cost, threading.Event())
+        try:
+            while True:
+                # Clear before checking, so a wakeup between the check and the wait isn't lost
+                ticket.event.clear()
+                wait = self._try_grant(ticket)
+                if wait == 0:
+                    break
+                ticket.event.wait(min(wait or MAX_WAIT, MAX_WAIT))
+        except BaseException:
+            self._cancel(ticket)
+            raise
+        self._count("queued_s", time.monotonic() - started)
+
+    async def acquire_async(self, session=None, priority=TURN_PRIORITY, cost=1):
+        """acquire for the event loop: waits without blocking other sessions' turns"""
+        started = time.monotonic()
+        ticket = self._enqueue(session, priority, cost, asyncio.Event(), asyncio.get_running_loop())
+        try:
+            while True:
+                ticket.event.clear()
+                wait = self._try_grant(ticket)
+                if wait == 0:
+                    break
+                try:
+                    await asyncio.wait_for(ticket.event.wait(), min(wait or MAX_WAIT, MAX_WAIT))
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._cancel(ticket)
+            raise
+        self._count("queued_s", time.monotonic() - started)
+
+    def observe(self, headers):
+        """Sync the buckets with a response's rate-limit headers"""
+        now = time.monotonic()
+        with self._lock:
+            for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+                limit = _int_header(headers, f"x-ratelimit-limit-{kind}")
+                remaining = _int_header(headers, f"x-ratelimit-remaining-{kind}")
+                reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                if limit or remaining is not None:
+                    bucket.sync(limit, remaining, reset, now)
+
+    def _backoff(self, error, attempt):
+        """Seconds to wait before retrying `error`, or None if it shouldn't be retried"""
+        from openai import APIConnectionError, APIStatusError, RateLimitError
+
+        if attempt >= self.max_retries:
+            return None
+        if isinstance(error, RateLimitError):
+            self._count("rate_limited")
+        elif isinstance(error, APIStatusError) and error.status_code >= 500:
+            self._count("server_errors")
+        elif not isinstance(error, APIConnectionError):
+            return None
+        delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+        response = getattr(error, "response", None)
+        if response is not None:
+            self.observe(response.headers)
+            retry_after = parse_duration(response.headers.get("retry-after"))
+            retry_after_ms = _int_header(response.headers, "retry-after-ms")
+            if retry_after_ms is not None:
+                retry_after = retry_after_ms / 1000
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+        if isinstance(error, RateLimitError):
+            with self._lock:
+                self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        self._count("retries")
+        return delay
+
+    def create(self, client, session=None, priority=TURN_PRIORITY, **kwargs):
+        """client.chat.completions.create(**kwargs) behind the gate, with retries"""
+        # The SDK is loaded by the time a client exists; importing here keeps it off the start-up path
+        from openai import APIConnectionError, APIStatusError
+
+        cost = estimate_tokens(kwargs)
+        for attempt in itertools.count():
+            self.acquire(session, priority, cost)
+            self._count("calls")
+            try:
+                raw = client.chat.completions.with_raw_response.create(**kwargs)
+            except (APIStatusError, APIConnectionError) as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            self.observe(raw.headers)
+            return raw.parse()
+
+    async def create_async(self, client, session=None, priority=TURN_PRIORITY, **kwargs):
+        """create for an AsyncOpenAI client"""
+        from openai import APIConnectionError, APIStatusError
+
+        cost = estimate_tokens(kwargs)
+        for attempt in itertools.count():
+            await self.acquire_async(session, priority, cost)
+            self._count("calls")
+            try:
+                raw = await client.chat.completions.with_raw_response.create(**kwargs)
+            except (APIStatusError, APIConnectionError) as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self.observe(raw.headers)
+            return raw.parse()
+
+
+def _int_header(headers, name):
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide scheduler shared by every session and app in the process"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RateLimitScheduler()
+        return _scheduler
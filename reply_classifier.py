@@ -0,0 +1,106 @@
+import re
+
+# Phrases in assistant replies that the interview state machine reacts to,
+# mapped to the event each one raises. Phrases are matched against the
+# lowercased reply with curly apostrophes straightened.
+REPLY_PHRASES = {
+    "correctness": "correctness",
+    "correct": "correct",
+    "optimal": "optimal",
+    "what": "what",
+    "?": "question_mark",
+    "not quite": "not_quite",
+    "miss": "miss",
+    "ready to jump into some coding": "ready_for_coding",
+    "shall we proceed to the coding challenges": "ready_for_coding",
+    "what's up": "whats_up",
+    "coding challenge": "coding_challenge",
+    "any quick questions to sort this out": "clarify_prompt",
+    "any clarifying questions": "clarify_prompt",
+    "awesome—code it up": "code_it_up",
+    "please implement your solution": "code_it_up",
+    "nice": "nice",
+    "that's a wrap": "wrap_up",
+    "interview concluded": "wrap_up",
+}
+
+# Phrases in the candidate's message
+INPUT_PHRASES = {
+    "yes": "yes",
+    "sure": "sure",
+    "no": "no",
+    "ready": "ready",
+    "wrap up": "wrap_up",
+}
+
+SCORE_PATTERN = re.compile(r"score\s*:\s*\**\s*(\d{1,3})")
+
+_NORMALIZE = str.maketrans({"’": "'", "‘": "'"})
+
+
+class PhraseMatcher:
+    """
+    Find every phrase of a fixed set in one regex pass.
+
+    The alternation sits inside a lookahead so a match is attempted at
+    every offset, and alternatives are ordered longest first. A phrase
+    that contains other phrases ("correctness" contains "correct") raises
+    their events too, so the result equals running `phrase in text` for
+    each phrase separately.
+    """
+
+    def __init__(self, phrases):
+        ordered = sorted(phrases, key=len, reverse=True)
+        self._pattern = re.compile("(?=(" + "|".join(re.escape(phrase) for phrase in ordered) + "))")
+        self._events = {
+            phrase: frozenset(event for other, event in phrases.items() if other in phrase)
+            for phrase in phrases
+        }
+
+    def scan(self, normalized):
+        events = set()
+        for match in self._pattern.finditer(normalized):
+            events |= self._events[match.group(1)]
+        return frozenset(events)
+
+
+class ReplyEvents:
+    """Events raised by one assistant reply, plus the score it states (or None)"""
+
+    __slots__ = ("events", "score")
+
+    def __init__(self, events=frozenset(), score=None):
+        self.events = events
+        self.score = score
+
+    def __contains__(self, event):
+        return event in self.events
+
+    def __repr__(self):
+        return f"ReplyEvents({sorted(self.events)}, score={self.score})"
+
+    def merge(self, other):
+        """Events for this reply with `other`'s text appended to it"""
+        score = self.score if self.score is not None else other.score
+        return ReplyEvents(self.events | other.events, score)
+
+
+_reply_matcher = PhraseMatcher(REPLY_PHRASES)
+_input_matcher = PhraseMatcher(INPUT_PHRASES)
+
+
+def normalize(text):
+    """Lowercase once and straighten curly apostrophes"""
+    return text.lower().translate(_NORMALIZE)
+
+
+def classify_reply(text):
+    """Scan an assistant reply once and return its ReplyEvents"""
+    normalized = normalize(text)
+    match = SCORE_PATTERN.search(normalized)
+    return ReplyEvents(_reply_matcher.scan(normalized), int(match.group(1)) if match else None)
+
+
+def classify_input(text):
+    """Return the set of events raised by the candidate's message"""
+    return _input_matcher.scan(normalize(text))
@@ -0,0 +1,573 @@
+"""
+Runs candidate code against test cases in isolated worker processes.
+
+RestrictedEnv (whitelisted imports, builtins without open/eval/exec) only
+keeps honest code honest; Python introspection gets around it. The
+boundary is the process: every task runs in a child forked from a pool
+worker that, before running anything, drops to an unprivileged uid,
+enters new user, mount and network namespaces, chroots into an empty
+read-only directory and installs a seccomp filter that denies sockets,
+exec, signalling or tracing other processes and changing namespaces or
+mounts. Its only channel back is a pipe carrying JSON.
+
+Isolation needs Linux with unprivileged user namespaces and seccomp
+(x86_64 or aarch64). Elsewhere no code is run and the tests report an
+error, unless SANDBOX_ISOLATION=0 is set for local development, which
+runs submissions with rlimits only and must never be used in production.
+"""
+import builtins
+import json
+import math
+import multiprocessing
+import os
+import re
+import select
+import signal
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, only the wall-clock timeouts
+    resource = None
+
+# Modules submitted code may import
+ALLOWED_MODULES = (
+    "bisect", "collections", "copy", "dataclasses", "functools", "heapq",
+    "itertools", "math", "operator", "re", "string", "typing",
+)
+
+# Builtins left out: file, process and introspection escapes
+BLOCKED_BUILTINS = {
+    "__import__", "breakpoint", "compile", "eval", "exec", "exit", "globals",
+    "help", "input", "locals", "memoryview", "open", "quit", "vars",
+}
+
+# Per-test limits
+TEST_TIME_LIMIT = float(os.getenv("SANDBOX_TIME_LIMIT", "2"))
+TEST_MEMORY_LIMIT_MB = int(os.getenv("SANDBOX_MEMORY_MB", "256"))
+# Namespaces, chroot and seccomp around every worker; "0" turns them off (development only)
+SANDBOX_ISOLATION = os.getenv("SANDBOX_ISOLATION", "1") != "0"
+# Unprivileged uid/gid workers switch to when the app runs as root
+SANDBOX_UID = int(os.getenv("SANDBOX_UID", "65534"))
+# Most a sandboxed task may send back
+MAX_RESULT_BYTES = 1024 * 1024
+# Slack on top of the time limit before the parent gives up on a worker
+RESULT_GRACE = 2.0
+POOL_WORKERS = min(4, os.cpu_count() or 1)
+MAX_OUTPUT_CHARS = 200
+
+CODE_BLOCK = re.compile(r"```[\w+-]*\n(.*?)```", re.DOTALL)
+
+
+class SandboxTimeout(Exception):
+    """Raised inside a worker when a test runs past its time limit"""
+
+
+class SandboxError(RuntimeError):
+    """Raised in the parent when a sandbox worker crashes or never answers"""
+
+
+class SandboxUnavailable(SandboxError):
+    """Raised when the isolation can't be set up here; no submitted code ran"""
+
+
+class RestrictedEnv(dict):
+    """
+    Globals for submitted code: builtins minus the obvious escapes, imports
+    only from allowed modules. Not a security boundary on its own.
+    """
+
+    def __init__(self, allowed_modules=ALLOWED_MODULES):
+        super().__init__()
+        self.allowed_modules = allowed_modules
+        safe = {name: value for name, value in vars(builtins).items() if name not in BLOCKED_BUILTINS}
+        safe["__import__"] = self.import_module
+        self["__builtins__"] = safe
+        self["__name__"] = "submission"
+
+    def import_module(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name.split(".")[0] not in self.allowed_modules:
+            raise ImportError(f"Module {name} not allowed")
+        return __import__(name, globals, locals, fromlist, level)
+
+
+def extract_code(message):
+    """Pull the code out of a candidate message: the longest fenced block, else the whole text"""
+    blocks = CODE_BLOCK.findall(message)
+    return max(blocks, key=len) if blocks else message
+
+
+def _normalize(value):
+    """Compare tuples and lists alike"""
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def _matches(output, expected, unordered=False):
+    output, expected = _normalize(output), _normalize(expected)
+    if unordered and isinstance(output, list) and isinstance(expected, list):
+        try:
+            return sorted(output) == sorted(expected)
+        except TypeError:
+            pass
+    return output == expected
+
+
+def _entry_point(env, function):
+    """Find the callable to test: the named function, a LeetCode-style Solution method, or the last function defined"""
+    if function and callable(env.get(function)):
+        return env[function]
+    solution = env.get("Solution")
+    if isinstance(solution, type):
+        instance = solution()
+        if function and callable(getattr(instance, function, None)):
+            return getattr(instance, function)
+        methods = [name for name, value in vars(solution).items() if callable(value) and not name.startswith("_")]
+        if len(methods) == 1:
+            return getattr(instance, methods[0])
+    functions = [value for name, value in env.items() if isinstance(value, types.FunctionType) and not name.startswith("_")]
+    if functions:
+        return functions[-1]
+    raise NameError(f"No function named {function or 'solution'} found")
+
+
+def load_submission(code, function=None):
+    """Exec submitted code in a RestrictedEnv and return the function to call"""
+    env = RestrictedEnv()
+    exec(compile(code, "<submission>", "exec"), env)
+    return _entry_point(env, function)
+
+
+def _on_timeout(signum, frame):
+    raise SandboxTimeout()
+
+
+CLONE_NEWNS = 0x00020000
+CLONE_NEWUSER = 0x10000000
+CLONE_NEWNET = 0x40000000
+PR_SET_NO_NEW_PRIVS = 38
+PR_SET_SECCOMP = 22
+SECCOMP_MODE_FILTER = 2
+SECCOMP_RET_ALLOW = 0x7FFF0000
+SECCOMP_RET_KILL_PROCESS = 0x80000000
+SECCOMP_RET_EPERM = 0x00050000 | 1
+
+# Syscalls denied to workers: sockets, exec, other processes, namespaces, mounts,
+# chmod (the jail directory stays read-only) and kernel interfaces that bypass seccomp.
+# Numbers 424 and up are the same on every architecture.
+_COMMON_DENIED = (
+    424, 425, 426, 427, 428, 429, 430, 431, 432, 433, 434, 435, 438, 452,
+)
+DENIED_SYSCALLS = {
+    # AUDIT_ARCH_X86_64
+    "x86_64": (0xC000003E, (
+        41, 42, 43, 49, 50, 53, 288,  # socket, connect, accept, bind, listen, socketpair, accept4
+        59, 322,  # execve, execveat
+        62, 200, 234, 129, 297, 101, 310, 311,  # kill, tkill, tgkill, rt_(tg)sigqueueinfo, ptrace, process_vm_*
+        90, 91, 268,  # chmod, fchmod, fchmodat
+        165, 166, 155, 161, 272, 308,  # mount, umount2, pivot_root, chroot, unshare, setns
+        303, 304, 321, 298, 323, 248, 249, 250,  # *_handle_at, bpf, perf_event_open, userfaultfd, keys
+    ) + _COMMON_DENIED),
+    # AUDIT_ARCH_AARCH64
+    "aarch64": (0xC00000B7, (
+        198, 203, 202, 200, 201, 199, 242,
+        221, 281,
+        129, 130, 131, 138, 240, 117, 270, 271,
+        52, 53,
+        40, 39, 41, 51, 97, 268,
+        264, 265, 280, 241, 282, 217, 218, 219,
+    ) + _COMMON_DENIED),
+}
+# x32 system calls on x86_64 have this bit set; all of them are denied
+X32_SYSCALL_BIT = 0x40000000
+
+
+def _seccomp_program(arch, denied):
+    """Classic BPF: kill on a foreign architecture, EPERM for `denied`, allow the rest"""
+    load, jeq, jge, ret = 0x20, 0x15, 0x35, 0x06
+    program = [
+        (load, 0, 0, 4),  # seccomp_data.arch
+        (jeq, 1, 0, arch),
+        (ret, 0, 0, SECCOMP_RET_KILL_PROCESS),
+        (load, 0, 0, 0),  # seccomp_data.nr
+        (jge, len(denied) + 1, 0, X32_SYSCALL_BIT),
+    ]
+    program += [(jeq, len(denied) - i, 0, number) for i, number in enumerate(denied)]
+    program += [(ret, 0, 0, SECCOMP_RET_ALLOW), (ret, 0, 0, SECCOMP_RET_EPERM)]
+    return program
+
+
+def _isolate(jail, keep):
+    """Confine this process for good, keeping only descriptor `keep`; raises OSError if the platform can't"""
+    # Only sandbox children need these; keep them off the app start-up path
+    import ctypes
+    import platform
+
+    class SockFilter(ctypes.Structure):
+        _fields_ = [("code", ctypes.c_ushort), ("jt", ctypes.c_ubyte), ("jf", ctypes.c_ubyte), ("k", ctypes.c_uint)]
+
+    class SockFprog(ctypes.Structure):
+        _fields_ = [("len", ctypes.c_ushort), ("filter", ctypes.POINTER(SockFilter))]
+
+    arch, denied = DENIED_SYSCALLS.get(platform.machine().lower(), (None, None))
+    if not sys.platform.startswith("linux") or arch is None:
+        raise OSError(f"no sandbox for {sys.platform}/{platform.machine()}")
+    libc = ctypes.CDLL(None, use_errno=True)
+
+    def check(result, what):
+        if result != 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"{what}: {os.strerror(errno)}")
+
+    # Nothing inherited reaches outside, the pool's own pipes included: stdio goes to /dev/null
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.closerange(3, keep)
+    os.closerange(keep + 1, os.sysconf("SC_OPEN_MAX"))
+
+    if os.getuid() == 0:
+        os.setgroups([])
+        os.setgid(SANDBOX_UID)
+        os.setuid(SANDBOX_UID)
+    # A user namespace lets an unprivileged process make the others: no network, private mounts
+    check(libc.unshare(CLONE_NEWUSER | CLONE_NEWNS | CLONE_NEWNET), "unshare")
+    check(libc.chroot(jail.encode()), "chroot")
+    os.chdir("/")
+
+    program = _seccomp_program(arch, denied)
+    filters = (SockFilter * len(program))(*program)
+    fprog = SockFprog(len(program), filters)
+    check(libc.prctl(PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0), "no_new_privs")
+    check(libc.prctl(PR_SET_SECCOMP, SECCOMP_MODE_FILTER, ctypes.byref(fprog), 0, 0), "seccomp")
+
+
+def _apply_limits(time_limit, cases, memory_limit_mb):
+    """Limits for the process running a task; it exits afterwards, so they never need lifting"""
+    if resource is not None:
+        limits = [
+            # Hard CPU cap for the whole task; arm() re-arms the soft limit per case
+            (resource.RLIMIT_CPU, (math.ceil(time_limit), math.ceil(time_limit * cases) + 1)),
+            (resource.RLIMIT_AS, (memory_limit_mb * 1024 * 1024,) * 2),
+            (resource.RLIMIT_FSIZE, (0, 0)),
+            (getattr(resource, "RLIMIT_NPROC", None), (0, 0)),
+        ]
+        for limit, value in limits:
+            if limit is None:
+                continue
+            try:
+                resource.setrlimit(limit, value)
+            except (ValueError, OSError):
+                pass  # Not supported here (RLIMIT_AS on macOS)
+        # Soft CPU limit raises in Python instead of killing the worker
+        signal.signal(signal.SIGXCPU, _on_timeout)
+    if hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _on_timeout)
+
+
+def arm(time_limit):
+    """Start the wall-clock and CPU budget for one test case"""
+    if resource is not None:
+        used = resource.getrusage(resource.RUSAGE_SELF)
+        soft = math.ceil(used.ru_utime + used.ru_stime + time_limit)
+        hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+        try:
+            resource.setrlimit(resource.RLIMIT_CPU, (min(soft, hard), hard))
+        except (ValueError, OSError):
+            pass
+    if hasattr(signal, "setitimer"):
+        signal.setitimer(signal.ITIMER_REAL, time_limit)
+
+
+def disarm():
+    """Stop the wall-clock budget started by arm"""
+    if hasattr(signal, "setitimer"):
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _error_message(error, time_limit, memory_limit_mb):
+    if isinstance(error, SandboxTimeout):
+        return f"Time limit exceeded ({time_limit:g}s)"
+    if isinstance(error, MemoryError):
+        return f"Memory limit exceeded ({memory_limit_mb} MB)"
+    if isinstance(error, RecursionError):
+        return "Recursion too deep"
+    return f"{type(error).__name__}: {error}"[:MAX_OUTPUT_CHARS]
+
+
+def _run_cases(code, function, tests, time_limit, memory_limit_mb):
+    """Sandboxed task: load a submission once and run a batch of its test cases"""
+    results = []
+    entry, load_error = None, None
+    timed_out = False
+    try:
+        arm(time_limit)
+        entry = load_submission(code, function)
+    except BaseException as e:
+        load_error = _error_message(e, time_limit, memory_limit_mb)
+    finally:
+        disarm()
+
+    for test in tests:
+        result = {"passed": False, "error": load_error, "output": None, "elapsed_ms": None}
+        if timed_out:
+            # A case already ran out of time (likely an infinite loop); don't spend
+            # another full time limit on each of the rest, one after another
+            result["error"] = _error_message(SandboxTimeout(), time_limit, memory_limit_mb)
+        elif entry is not None:
+            started = time.perf_counter()
+            try:
+                arm(time_limit)
+                output = entry(*test["args"])
+                disarm()
+                result["passed"] = _matches(output, test["expected"], test.get("unordered", False))
+                result["output"] = repr(output)[:MAX_OUTPUT_CHARS]
+            except BaseException as e:
+                disarm()
+                timed_out = isinstance(e, SandboxTimeout)
+                result["error"] = _error_message(e, time_limit, memory_limit_mb)
+            result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        results.append(result)
+    return results
+
+
+class TestReport:
+    """Pass/fail results for one submission, one entry per test case"""
+
+    __slots__ = ("results", "error")
+
+    def __init__(self, results, error=None):
+        self.results = results
+        self.error = error
+
+    def __repr__(self):
+        return f"TestReport({self.passed}/{self.total} passed)"
+
+    @property
+    def passed(self):
+        return sum(result["passed"] for result in self.results)
+
+    @property
+    def total(self):
+        return len(self.results)
+
+    @property
+    def pass_rate(self):
+        return self.passed / self.total if self.total else 0.0
+
+    def summary(self, max_failures=3):
+        """Short plain-text report for the evaluation prompt"""
+        if self.error:
+            return f"Could not run the tests: {self.error}"
+        lines = [f"{self.passed}/{self.total} test cases passed."]
+        failures = [(i, result) for i, result in enumerate(self.results, 1) if not result["passed"]]
+        for i, result in failures[:max_failures]:
+            detail = result["error"] or f"got {result['output']}, expected {result['expected']}"
+            lines.append(f"Case {i} failed: {detail}")
+        return "\n".join(lines)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_jail = None
+
+
+def _get_jail():
+    """The empty, read-only directory workers chroot into"""
+    global _jail
+    with _pool_lock:
+        if _jail is None:
+            import tempfile
+
+            _jail = tempfile.mkdtemp(prefix="sandbox-")
+            os.chmod(_jail, 0o555)
+        return _jail
+
+
+def _get_pool():
+    """Return the shared sandbox pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # A fresh worker per test, forked from a clean server rather than the threaded app
+            if sys.platform == "win32":
+                context = multiprocessing.get_context("spawn")
+            else:
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload([__name__])
+            _pool = ProcessPoolExecutor(max_workers=POOL_WORKERS, mp_context=context, max_tasks_per_child=1)
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _run_isolated(write_fd, task, args, time_limit, cases, memory_limit_mb, jail):
+    """Forked child: isolate, run `task` and write its result to `write_fd` as JSON, then exit"""
+    try:
+        # The chroot is empty, so whatever submissions may import has to be loaded first
+        for name in ALLOWED_MODULES:
+            __import__(name)
+        _isolate(jail, write_fd)
+    except OSError as e:
+        payload = {"unavailable": str(e)}
+    else:
+        try:
+            _apply_limits(time_limit, cases, memory_limit_mb)
+            payload = {"result": task(*args)}
+        except BaseException as e:
+            payload = {"error": _error_message(e, time_limit, memory_limit_mb)}
+    try:
+        data = json.dumps(payload).encode()
+    except Exception:
+        data = b'{"error": "The result could not be sent back"}'
+    while data:
+        data = data[os.write(write_fd, data):]
+    os._exit(0)
+
+
+def _collect(read_fd, pid, timeout):
+    """
+    Read the child's JSON result, killing it if it runs late or sends too
+    much. Returns (payload or None, whether it ran out of time).
+    """
+    chunks, size, late = [], 0, False
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([read_fd], [], [], remaining)[0]:
+            late = True
+            break
+        chunk = os.read(read_fd, 65536)
+        size += len(chunk)
+        if not chunk or size > MAX_RESULT_BYTES:
+            break
+        chunks.append(chunk)
+    os.close(read_fd)
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    os.waitpid(pid, 0)
+    try:
+        payload = json.loads(b"".join(chunks))
+    except ValueError:
+        return None, late
+    return (payload if isinstance(payload, dict) else None), late
+
+
+def _sandboxed(task, args, time_limit, cases, memory_limit_mb, jail):
+    """Process pool task: run `task` under the limits, in an isolated child process"""
+    if not SANDBOX_ISOLATION:
+        _apply_limits(time_limit, cases, memory_limit_mb)
+        return task(*args)
+    if not hasattr(os, "fork"):
+        raise SandboxUnavailable(f"Code execution is unavailable: no sandbox for {sys.platform}")
+    # unshare() needs a single-threaded process, and a pool worker may have started
+    # threads importing the app's __main__, so each task gets a fresh fork. The child
+    # answers over its own pipe in JSON: nothing it writes is ever unpickled, and it
+    # can't reach the pool's pipes to the app.
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            _run_isolated(write_fd, task, args, time_limit, cases, memory_limit_mb, jail)
+        finally:
+            os._exit(1)  # Never return into the pool worker's code
+    os.close(write_fd)
+    # Half the grace, so the worker answers before the app gives up on it
+    payload, late = _collect(read_fd, pid, cases * time_limit + RESULT_GRACE / 2)
+    if payload is None:
+        raise SandboxError(f"Time limit exceeded ({time_limit:g}s)" if late else "Worker crashed")
+    if "unavailable" in payload:
+        raise SandboxUnavailable(f"Code execution is unavailable: the sandbox could not be set up ({payload['unavailable']})")
+    if "error" in payload:
+        raise SandboxError(str(payload["error"])[:MAX_OUTPUT_CHARS])
+    return payload.get("result")
+
+
+def run_sandboxed(task, *args, time_limit=TEST_TIME_LIMIT, cases=1, memory_limit_mb=TEST_MEMORY_LIMIT_MB):
+    """
+    Run task(*args) in a fresh sandbox worker and return its result.
+    The worker gets a CPU budget of `cases` runs of `time_limit` each;
+    the task should arm() the per-run limit itself.
+    """
+    future = _get_pool().submit(_sandboxed, task, args, time_limit, cases, memory_limit_mb, _get_jail())
+    try:
+        return future.result(timeout=cases * time_limit + RESULT_GRACE)
+    except BrokenProcessPool:
+        _reset_pool()
+        raise SandboxError("Worker crashed") from None
+    except TimeoutError:
+        future.cancel()
+        raise SandboxError("Sandbox timed out") from None
+
+
+def _case_result(result):
+    """One case's result as sent back by a worker, reduced to the expected fields and types"""
+    if not isinstance(result, dict):
+        result = {"error": "Malformed sandbox result"}
+    elapsed = result.get("elapsed_ms")
+    return {
+        "passed": result.get("passed") is True,
+        "error": None if result.get("error") is None else str(result["error"])[:MAX_OUTPUT_CHARS],
+        "output": None if result.get("output") is None else str(result["output"])[:MAX_OUTPUT_CHARS],
+        "elapsed_ms": elapsed if isinstance(elapsed, (int, float)) and not isinstance(elapsed, bool) else None,
+    }
+
+
+def run_tests(code, tests, function=None, time_limit=TEST_TIME_LIMIT, memory_limit_mb=TEST_MEMORY_LIMIT_MB):
+    """
+    Run submitted code against test cases in sandboxed pool workers.
+    `tests` is a list of {"args": [...], "expected": ..., "unordered": bool};
+    the cases are split into one batch per worker and run in parallel.
+    Returns a TestReport.
+    """
+    try:
+        compile(code, "<submission>", "exec")
+    except SyntaxError as e:
+        return TestReport([], error=f"SyntaxError: {e.msg} (line {e.lineno})")
+    if not tests:
+        return TestReport([])
+
+    pool, jail = _get_pool(), _get_jail()
+    size = math.ceil(len(tests) / POOL_WORKERS)
+    batches = [tests[i:i + size] for i in range(0, len(tests), size)]
+    futures = [
+        pool.submit(_sandboxed, _run_cases, (code, function, batch, time_limit, memory_limit_mb), time_limit, len(batch), memory_limit_mb, jail)
+        for batch in batches
+    ]
+    results = []
+    deadline = time.monotonic() + size * time_limit + RESULT_GRACE
+    for batch, future in zip(batches, futures):
+        try:
+            batch_results = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except BrokenProcessPool:
+            # A worker was killed outright (hard CPU limit); start over with a new pool next time
+            _reset_pool()
+            batch_results = [{"passed": False, "error": "Worker crashed", "output": None, "elapsed_ms": None}] * len(batch)
+        except TimeoutError:
+            future.cancel()
+            batch_results = [{"passed": False, "error": f"Time limit exceeded ({time_limit:g}s)", "output": None, "elapsed_ms": None}] * len(batch)
+        except SandboxUnavailable as e:
+            # Nothing ran, so no case can count as passed
+            return TestReport([], error=str(e))
+        except SandboxError as e:
+            batch_results = [{"passed": False, "error": str(e), "output": None, "elapsed_ms": None}] * len(batch)
+        if not isinstance(batch_results, list) or len(batch_results) != len(batch):
+            batch_results = [{"passed": False, "error": "Malformed sandbox result", "output": None, "elapsed_ms": None}] * len(batch)
+        for test, result in zip(batch, batch_results):
+            results.append({**_case_result(result), "expected": repr(test["expected"])[:MAX_OUTPUT_CHARS]})
+    return TestReport(results)
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from resume_store import ResumeStore
+
+
+def content_hash(data):
+    """Return the SHA-256 hex digest used to key a resume's bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResumeCache:
+    """
+    Bounded LRU cache of parsed resumes keyed by content hash.
+
+    Entries are (text, links) tuples. If `disk_dir` is set, every parsed
+    resume is also written there as JSON so a restarted process can skip
+    parsing files it has already seen. `store` is a read-only ResumeStore
+    of resumes parsed ahead of time by ingest_resumes.py.
+    """
+
+    def __init__(self, max_entries=64, disk_dir=None, store=None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.store = store
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        """Return the cached (text, links) for a hash, or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        entry = self._read_disk(key) or self._read_store(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key, text, links):
+        """Store a parsed resume in memory and, if configured, on disk"""
+        entry = (text, list(links))
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+        return entry
+
+    def get_or_extract(self, file, extract):
+        """
+        Return (key, text, links) for an uploaded file, calling
+        `extract(file)` only when the content has not been seen before.
+        Empty results are not cached so a failed parse can be retried.
+        """
+        key = content_hash(file.getvalue())
+        entry = self.get(key)
+        if entry is None:
+            text, links = extract(file)
+            if not text and not links:
+                return key, text, links
+            entry = self.put(key, text, links)
+        return (key,) + entry
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                data = json.load(f)
+            return data["text"], data["links"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _read_store(self, key):
+        record = self.store.get(key) if self.store is not None else None
+        return (record["text"], record["links"]) if record else None
+
+    def _write_disk(self, key, entry):
+        if not self.disk_dir:
+            return
+        # Write to a temporary name first so readers never see a partial file
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"text": entry[0], "links": entry[1]}, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_resume_cache():
+    """
+    Return the process-wide resume cache. Imported modules survive
+    Streamlit reruns, so every session in the process shares it.
+    Set RESUME_CACHE_DIR to enable the on-disk tier, and RESUME_STORE_DIR
+    to serve resumes bulk-parsed by ingest_resumes.py.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            store_dir = os.getenv("RESUME_STORE_DIR")
+            _cache = ResumeCache(
+                max_entries=int(os.getenv("RESUME_CACHE_SIZE", "64")),
+                disk_dir=os.getenv("RESUME_CACHE_DIR") or None,
+                store=ResumeStore(store_dir) if store_dir else None,
+            )
+        return _cache
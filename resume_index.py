@@ -0,0 +1,185 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from context_window import count_tokens, truncate_to_tokens
+
+# Resume sections sent with one resume-review turn, and the tokens they may take up
+RESUME_TOP_K = int(os.getenv("RESUME_TOP_K", "3"))
+RESUME_SECTION_BUDGET = int(os.getenv("RESUME_SECTION_BUDGET", "300"))
+# Indexes kept in memory, one per resume, like the parsed-resume cache
+MAX_INDEXES = int(os.getenv("RESUME_CACHE_SIZE", "64"))
+# Long sections are cut into chunks of about this size, so one job or project is one hit
+CHUNK_TOKENS = 120
+# BM25 term-saturation and length-normalization parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_HEADINGS = (
+    r"(?:professional |work |relevant )?experience|employment(?: history)?|work history|"
+    r"(?:personal |academic |side )?projects?|(?:technical |core )?skills|technologies|tech stack|"
+    r"education|summary|profile|objective|about me|certifications?|awards|achievements|"
+    r"publications|volunteering|leadership|languages|interests"
+)
+# A heading on a line of its own ("EXPERIENCE", "Projects:"), or inline at the start of a sentence ("Skills: ...")
+LINE_HEADING = re.compile(rf"^[ \t]*({_HEADINGS})[ \t]*:?[ \t]*$", re.IGNORECASE | re.MULTILINE)
+INLINE_HEADING = re.compile(rf"(?:^|(?<=[.;|]) )[ \t]*({_HEADINGS})[ \t]*:", re.IGNORECASE | re.MULTILINE)
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = frozenset(
+    "a an and are as at be but by can did do does for from had has have how i in is it its me my "
+    "of on or so that the their them then there they this to was we were what when where which who "
+    "why with would you your".split()
+)
+
+
+def tokenize(text):
+    return [term for term in TOKEN_PATTERN.findall(text.lower()) if term not in STOPWORDS]
+
+
+def _pieces(line, max_tokens):
+    """A line as is, or cut at word boundaries into pieces of at most `max_tokens` if it is longer"""
+    if count_tokens(line) <= max_tokens:
+        yield line
+        return
+    piece, used = [], 0
+    for word in line.split():
+        cost = count_tokens(f" {word}")
+        if piece and used + cost > max_tokens:
+            yield " ".join(piece)
+            piece, used = [], 0
+        piece.append(word)
+        used += cost
+    if piece:
+        yield " ".join(piece)
+
+
+def _chunks(body, max_tokens=CHUNK_TOKENS):
+    """Group a section's lines into chunks of at most `max_tokens`, breaking at blank lines"""
+    chunk, used = [], 0
+    for line in body.splitlines():
+        line = line.strip()
+        if not line:
+            if chunk:
+                yield " ".join(chunk)
+                chunk, used = [], 0
+            continue
+        # A paragraph with no line breaks (or a whole resume from an old cache entry) still splits
+        for piece in _pieces(line, max_tokens):
+            cost = count_tokens(piece)
+            if chunk and used + cost > max_tokens:
+                yield " ".join(chunk)
+                chunk, used = [], 0
+            chunk.append(piece)
+            used += cost
+    if chunk:
+        yield " ".join(chunk)
+
+
+def split_sections(text):
+    """
+    Split resume text into (heading, chunk) pairs, in document order. Text
+    before the first heading (name, contact details) gets the heading "".
+    """
+    matches = sorted(
+        list(LINE_HEADING.finditer(text)) + list(INLINE_HEADING.finditer(text)),
+        key=lambda match: match.start(),
+    )
+    sections = []
+    heading, start = "", 0
+    for match in matches:
+        if match.start() < start:
+            continue  # Both patterns can match the same heading
+        if heading and not text[start:match.start()].strip():
+            continue  # A label right under a heading ("SKILLS" then "Languages: ...") is content
+        sections += [(heading, chunk) for chunk in _chunks(text[start:match.start()])]
+        heading, start = match.group(1).strip().title(), match.end()
+    sections += [(heading, chunk) for chunk in _chunks(text[start:])]
+    return sections
+
+
+class ResumeIndex:
+    """
+    BM25 index over one resume's sections.
+
+    The resume is split into heading-labelled chunks once, and each
+    chunk's BM25 weight for every term is precomputed into a dense NumPy
+    matrix (a resume is a few dozen chunks and a few hundred terms), so a
+    query is a column sum and an argsort. Everything runs locally; no
+    embedding service is involved.
+    """
+
+    def __init__(self, text):
+        # NumPy is only needed once a resume is uploaded; keep it off the app start-up path
+        import numpy as np
+
+        self.sections = split_sections(text)
+        self.vocabulary = {}
+        rows, columns = [], []
+        for row, (heading, chunk) in enumerate(self.sections):
+            for term in tokenize(f"{heading} {chunk}"):
+                rows.append(row)
+                columns.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+        counts = np.zeros((len(self.sections), len(self.vocabulary)), dtype=np.float32)
+        np.add.at(counts, (rows, columns), 1)
+        lengths = counts.sum(axis=1, keepdims=True)
+        average = lengths.mean() if len(self.sections) else 1.0
+        documents = (counts > 0).sum(axis=0)
+        idf = np.log1p((len(self.sections) - documents + 0.5) / (documents + 0.5))
+        self.weights = idf * counts * (BM25_K1 + 1) / (counts + BM25_K1 * (1 - BM25_B + BM25_B * lengths / (average or 1.0)))
+
+    def __len__(self):
+        return len(self.sections)
+
+    def search(self, query, k=RESUME_TOP_K):
+        """Indices of the `k` best-matching sections for `query`, in document order"""
+        import numpy as np
+
+        columns = [self.vocabulary[term] for term in tokenize(query) if term in self.vocabulary]
+        if not columns:
+            return []
+        scores = self.weights[:, columns].sum(axis=1)
+        best = np.argsort(-scores, kind="stable")[:k]
+        return sorted(int(row) for row in best if scores[row] > 0)
+
+    def excerpt(self, query, k=RESUME_TOP_K, budget=RESUME_SECTION_BUDGET):
+        """
+        The top sections for `query` as prompt text within `budget` tokens.
+        With no matching terms the resume's first sections are used instead.
+        """
+        rows = self.search(query, k) or range(min(k, len(self.sections)))
+        lines, used = [], 0
+        for row in rows:
+            heading, chunk = self.sections[row]
+            line = f"{heading}: {chunk}" if heading else chunk
+            cost = count_tokens(line)
+            if used + cost > budget:
+                if lines:
+                    break
+                # Even the best section alone is over budget: send as much of it as fits
+                line, cost = truncate_to_tokens(line, budget), budget
+            lines.append(line)
+            used += cost
+        return "\n".join(lines)
+
+
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_resume_index(key, load):
+    """
+    Return the process-wide index for the resume with content hash `key`,
+    building it from `load()` (the resume text) the first time it's needed
+    """
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+    index = ResumeIndex(load())
+    with _indexes_lock:
+        _indexes[key] = index
+        while len(_indexes) > MAX_INDEXES:
+            _indexes.popitem(last=False)
+    return index
@@ -0,0 +1,200 @@
+import math
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+# PyPDF2 and python-docx are imported on first use, so app start-up and
+# candidates who never upload a resume don't pay for them
+
+PDF_TYPE = "application/pdf"
+DOCX_TYPES = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/msword",
+)
+
+# Guards so a huge upload can't tie up a worker
+MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_BYTES", str(5 * 1024 * 1024)))
+MAX_RESUME_PAGES = int(os.getenv("MAX_RESUME_PAGES", "40"))
+
+# PDFs with at least this many pages are split across the process pool
+PARALLEL_MIN_PAGES = int(os.getenv("RESUME_PARALLEL_MIN_PAGES", "8"))
+MIN_PAGES_PER_TASK = 4
+POOL_WORKERS = min(4, os.cpu_count() or 1)
+PARSE_TIMEOUT = 30
+
+
+class ResumeTooLargeError(ValueError):
+    """Raised when an upload exceeds the size, page-count or parse-time guards, or keeps crashing the parser"""
+
+
+def _page_links(page):
+    """Return the URI targets of a page's link annotations"""
+    links = []
+    annots = page.get("/Annots")
+    if not annots:
+        return links
+    for annot in annots.get_object():
+        annot_obj = annot.get_object()
+        action = annot_obj.get("/A")
+        if action is not None:
+            action = action.get_object()
+            if "/URI" in action:
+                links.append(str(action["/URI"]))
+    return links
+
+
+def _extract_pages(reader, start, stop):
+    """Extract text and annotation links from pages [start, stop) in one pass"""
+    texts = []
+    links = []
+    for page in reader.pages[start:stop]:
+        text = page.extract_text()
+        if text:
+            texts.append(text)
+        links.extend(_page_links(page))
+    return texts, links
+
+
+def _extract_page_range(data, start, stop):
+    """Process pool task: parse the PDF bytes and extract one page range"""
+    from PyPDF2 import PdfReader
+
+    return _extract_pages(PdfReader(BytesIO(data)), start, stop)
+
+
+_pool = None
+_pool_generation = 0
+_pool_pids = None  # Queue every pool's workers put (generation, pid) on
+_pool_lock = threading.Lock()
+
+
+def _report_pid(pids, generation):
+    """Pool initializer: tell the parent which process to kill if this worker hangs"""
+    pids.put((generation, os.getpid()))
+
+
+def _get_pool():
+    """Return the shared process pool, creating it on first use"""
+    global _pool, _pool_generation, _pool_pids
+    with _pool_lock:
+        if _pool is None:
+            # spawn avoids forking the threaded Streamlit server
+            context = multiprocessing.get_context("spawn")
+            # One queue for the life of the app: workers of a dropped pool may still be starting up
+            if _pool_pids is None:
+                _pool_pids = context.SimpleQueue()
+            _pool_generation += 1
+            _pool = ProcessPoolExecutor(max_workers=POOL_WORKERS, mp_context=context,
+                                        initializer=_report_pid, initargs=(_pool_pids, _pool_generation))
+        return _pool
+
+
+def _reset_pool(pool=None, kill=False):
+    """
+    Drop the shared pool (or only `pool`, if it is still the shared one);
+    with `kill`, its workers are killed rather than left to finish
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or (pool is not None and pool is not _pool):
+            return
+        pool, _pool = _pool, None
+        generation, pids = _pool_generation, []
+        while not _pool_pids.empty():
+            worker_generation, pid = _pool_pids.get()
+            if worker_generation == generation:
+                pids.append(pid)
+    # Workers stuck on a page never pick up the shutdown, so kill them first. They are
+    # our children and the pool hasn't reaped them yet, so their PIDs can't be reused
+    for pid in pids if kill else ():
+        try:
+            os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+        except OSError:
+            pass
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_pdf(data, max_pages=MAX_RESUME_PAGES):
+    """
+    Extract text and hyperlinks from PDF bytes.
+    Returns a tuple: (list_of_page_texts, list_of_hyperlinks)
+    """
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(BytesIO(data))
+    page_count = len(reader.pages)
+    if page_count > max_pages:
+        raise ResumeTooLargeError(f"Resume has {page_count} pages; the limit is {max_pages}.")
+    if page_count < PARALLEL_MIN_PAGES or POOL_WORKERS < 2:
+        return _extract_pages(reader, 0, page_count)
+
+    step = max(MIN_PAGES_PER_TASK, math.ceil(page_count / POOL_WORKERS))
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    deadline = time.monotonic() + PARSE_TIMEOUT
+    # A pool broken by another upload gets one retry on a fresh pool, within the same
+    # deadline; parsing inline instead could hang the app on the very PDF that broke it
+    for _ in range(2):
+        pool = _get_pool()
+        try:
+            futures = [pool.submit(_extract_page_range, data, start, stop) for start, stop in ranges]
+            _, running = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+            if running:
+                _reset_pool(pool, kill=True)
+                raise ResumeTooLargeError(f"Resume took more than {PARSE_TIMEOUT} seconds to parse.")
+            results = [future.result() for future in futures]
+            break
+        except BrokenProcessPool:
+            _reset_pool(pool)
+    else:
+        raise ResumeTooLargeError("Resume could not be parsed: it crashed the parser.")
+
+    texts = []
+    links = []
+    for page_texts, page_links in results:
+        texts.extend(page_texts)
+        links.extend(page_links)
+    return texts, links
+
+
+def extract_docx(data):
+    """
+    Extract text and hyperlinks from DOCX bytes in a single pass.
+    Returns a tuple: (list_of_paragraph_texts, list_of_hyperlinks)
+    """
+    import docx
+
+    doc = docx.Document(BytesIO(data))
+    texts = []
+    links = []
+    for para in doc.paragraphs:
+        texts.append(para.text)
+        for hyperlink in para.hyperlinks:
+            if hyperlink.address:
+                links.append(hyperlink.address)
+    return texts, links
+
+
+def extract_text_and_links(data, mime_type):
+    """
+    Extract text and hyperlinks from resume bytes.
+    Returns a tuple: (text_content, list_of_hyperlinks)
+    """
+    if len(data) > MAX_RESUME_BYTES:
+        raise ResumeTooLargeError(
+            f"Resume is {len(data) // 1024} KB; the limit is {MAX_RESUME_BYTES // 1024} KB."
+        )
+    if mime_type == PDF_TYPE:
+        texts, hyperlinks = extract_pdf(data)
+    elif mime_type in DOCX_TYPES:
+        texts, hyperlinks = extract_docx(data)
+    else:
+        return "", []
+
+    # Paragraph and page breaks stay line breaks: resume_index.py finds section headings by line.
+    # URLs written out in the text are picked up with the other contact details (contacts.py)
+    return "\n".join(texts), list(dict.fromkeys(hyperlinks))
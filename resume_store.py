@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+
+RECORDS_FILE = "resumes.jsonl"
+INDEX_FILE = "index.json"
+
+
+class ResumeStore:
+    """
+    Pre-parsed resumes written by ingest_resumes.py, keyed by content hash.
+
+    Records are appended to one JSON Lines file; index.json maps each hash
+    to the byte range of its line, so a lookup is one seek and one read.
+    The index also remembers which source files have been ingested (by
+    size and mtime), which is what lets an interrupted batch resume. A
+    record appended after the last index write is picked up again by
+    `recover()`, so the JSONL file is the source of truth.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.records_path = os.path.join(directory, RECORDS_FILE)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.resumes = {}  # hash -> [offset, length] in resumes.jsonl
+        self.files = {}  # source path -> {"size", "mtime", "hash"} or {"size", "mtime", "error"}
+        self._indexed_bytes = 0
+        self._index_mtime = None
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def __len__(self):
+        return len(self.resumes)
+
+    def __contains__(self, key):
+        return key in self.resumes
+
+    def _load_index(self):
+        try:
+            self._index_mtime = os.stat(self.index_path).st_mtime_ns
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.resumes = data.get("resumes", {})
+        self.files = data.get("files", {})
+        self._indexed_bytes = data.get("bytes", 0)
+
+    def _refresh(self):
+        """Reload the index if a batch run has rewritten it since it was read"""
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except OSError:
+            return
+        if mtime != self._index_mtime:
+            self._load_index()
+
+    def get(self, key):
+        """Return the stored record (hash, text, links, contacts) for a hash, or None"""
+        with self._lock:
+            if key not in self.resumes:
+                self._refresh()
+            location = self.resumes.get(key)
+        if location is None:
+            return None
+        offset, length = location
+        try:
+            with open(self.records_path, "rb") as f:
+                f.seek(offset)
+                return json.loads(f.read(length))
+        except (OSError, ValueError):
+            return None
+
+    def records(self):
+        """Iterate over every stored record, in the order they were ingested"""
+        for key in list(self.resumes):
+            record = self.get(key)
+            if record is not None:
+                yield record
+
+    def recover(self):
+        """
+        Index records appended after the last checkpoint and drop a
+        half-written last line. Returns the number of records recovered.
+        """
+        recovered = 0
+        try:
+            f = open(self.records_path, "r+b")
+        except FileNotFoundError:
+            return 0
+        with f:
+            f.seek(self._indexed_bytes)
+            offset = self._indexed_bytes
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self.resumes[record["hash"]] = [offset, len(line)]
+                source = record.get("source")
+                if source:
+                    self.files[source["path"]] = {"size": source["size"], "mtime": source["mtime"], "hash": record["hash"]}
+                offset += len(line)
+                recovered += 1
+            f.truncate(offset)
+        self._indexed_bytes = offset
+        return recovered
+
+    def append(self, record):
+        """Append one record (a dict with at least "hash") and index it"""
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.records_path, "ab") as f:
+            f.write(line)
+        self.resumes[record["hash"]] = [self._indexed_bytes, len(line)]
+        self._indexed_bytes += len(line)
+
+    def checkpoint(self):
+        """Write index.json atomically"""
+        os.makedirs(self.directory, exist_ok=True)
+        data = {"bytes": self._indexed_bytes, "resumes": self.resumes, "files": self.files}
+        # Write to a temporary name first so readers never see a partial file
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.index_path)
+        self._index_mtime = os.stat(self.index_path).st_mtime_ns
@@ -0,0 +1,208 @@
+import asyncio
+import json
+import logging
+import os
+import secrets
+import time
+
+from dotenv import load_dotenv
+from openai import OpenAIError
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.templating import Jinja2Templates
+
+from evaluation import ReviewStream
+from interview import (
+    InterviewState, accepts_input, build_messages, cancel_turn, finish_turn, init_state, needs_model, preload_resume,
+    request_priority, request_route, request_temperature, review_options, snapshot_state, start_turn,
+)
+from llm_client import get_async_client
+from metrics import USAGE_OPTIONS, TurnMetrics, get_metrics
+from model_router import ROUTES, route_stats
+from rate_limiter import get_scheduler
+from session_store import get_session_store
+from stream_renderer import aiter_deltas
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+templates = Jinja2Templates(directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"))
+
+SESSION_COOKIE = "recrewai_session"
+
+
+class Session:
+    """One candidate's interview: engine state plus a lock so turns run one at a time"""
+
+    __slots__ = ("state", "lock", "turn_times")
+
+    def __init__(self, state=None, persona=None, resume=None):
+        self.state = init_state(InterviewState(state or {}), persona)
+        preload_resume(self.state, resume)
+        self.lock = asyncio.Lock()
+        self.turn_times = []
+
+    def metrics(self):
+        avg_time = sum(self.turn_times) / len(self.turn_times) if self.turn_times else 0.0
+        return {"attempts": len(self.state.scores), "avg_time": avg_time}
+
+
+# Sessions survive restarts on disk; idle ones leave RAM when the memory budget is hit
+store = get_session_store(
+    restore=Session,
+    snapshot=lambda session: snapshot_state(session.state),
+    is_idle=lambda session: not session.lock.locked(),
+)
+
+
+def get_session(request, create=True):
+    """
+    Return (session_id, Session) for the request's cookie, starting a new
+    interview if needed; new interviews take the ?persona= query parameter
+    and ?resume=, the content hash of a resume from ingest_resumes.py.
+    A new interview is only stored, and given an id, if `create` is set:
+    page views that never submit a turn take no room in the store.
+    """
+    session_id = request.cookies.get(SESSION_COOKIE)
+    session = store.get(session_id) if session_id else None
+    if session is None:
+        session = Session(
+            persona=request.query_params.get("persona"),
+            resume=request.query_params.get("resume"),
+        )
+        if not create:
+            return None, session
+        session_id = secrets.token_urlsafe(16)
+        store.add(session_id, session)
+    return session_id, session
+
+
+def sse(data, event=None):
+    """Format one Server-Sent Events frame"""
+    frame = f"event: {event}\n" if event else ""
+    return f"{frame}data: {json.dumps(data)}\n\n"
+
+
+async def run_turn(session_id, session, user_input):
+    """Run one interview turn, yielding SSE frames: token deltas, then the final reply"""
+    async with session.lock:
+        started = time.perf_counter()
+        state = session.state
+        turn = TurnMetrics(state.phase)
+        # Submitted code runs in the sandbox pool; keep the event loop free meanwhile
+        with turn.stage("checks"):
+            checkpoint = await asyncio.to_thread(start_turn, state, user_input)
+
+        options = review_options(state)
+        chunks = []
+        review = ReviewStream()
+        postprocess = None
+        try:
+            # Turns the engine answers by itself send no request and stream nothing
+            if needs_model(state):
+                route = turn.route = request_route(state)
+                with turn.stage("prompt"):
+                    messages = build_messages(state)
+                requested = time.perf_counter()
+                # Queued fairly across sessions within the org's rate limits; 429s and 5xx are retried
+                stream = await get_scheduler().create_async(
+                    get_async_client(),
+                    session=session_id,
+                    priority=request_priority(state),
+                    messages=messages,
+                    temperature=request_temperature(state),
+                    stream=True,
+                    **ROUTES[route],
+                    **USAGE_OPTIONS,
+                    **options
+                )
+                stream = turn.awatch(stream, requested)
+                if options:
+                    # Code reviews arrive as a tool call; stream the feedback field from it
+                    async for chunk in stream:
+                        content = review.feed(chunk)
+                        if content:
+                            yield sse({"delta": content})
+                else:
+                    async for content in aiter_deltas(stream):
+                        chunks.append(content)
+                        yield sse({"delta": content})
+                route_stats.record(route, time.perf_counter() - requested)
+
+            # Phase transitions and coding flow run on the finished reply, off the event
+            # loop: picking the next problem or generating one can block
+            ai_response, evaluation = review.result() if options else ("".join(chunks), None)
+            postprocess = asyncio.ensure_future(asyncio.to_thread(finish_turn, state, user_input, ai_response, evaluation))
+            with turn.stage("postprocess"):
+                ai_response = await asyncio.shield(postprocess)
+        except BaseException as e:
+            # No reply, a failed one or a client that went away: drop the unanswered
+            # message so the next turn doesn't send two user messages in a row
+            if postprocess is not None and not postprocess.done():
+                # The engine thread can't be stopped; let it finish before undoing its changes
+                await asyncio.wait([postprocess])
+            cancel_turn(state, checkpoint)
+            if not isinstance(e, Exception):
+                raise
+            if isinstance(e, OpenAIError):
+                message = str(e)
+            else:
+                logger.exception("turn failed in session %s", session_id)
+                message = "something went wrong, please send that again"
+            yield sse({"error": f"Error getting a response: {message}"}, event="error")
+            return
+        turn.finish()
+        session.turn_times.append(time.perf_counter() - started)
+        # Write-behind: the snapshot is queued and committed by the store's writer thread
+        store.save(session_id, session)
+        yield sse({"response": ai_response, "phase": state.phase, **session.metrics()}, event="done")
+
+
+async def index(request):
+    # The interview is stored on the first /submit, which sets the cookie
+    session_id, session = get_session(request, create=False)
+    response = templates.TemplateResponse(request, "index.html", {
+        "messages": session.state.messages[1:],
+        **session.metrics(),
+    })
+    if session_id:
+        response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite="lax")
+    return response
+
+
+async def submit(request):
+    session_id, session = get_session(request)
+    form = await request.form()
+    user_input = (form.get("user_input") or "").strip()
+    if not user_input:
+        return JSONResponse({"error": "Please type a response."}, status_code=400)
+    if not accepts_input(session.state):
+        return JSONResponse({"error": "The interview has concluded."}, status_code=409)
+    response = StreamingResponse(
+        run_turn(session_id, session, user_input),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite="lax")
+    return response
+
+
+async def metrics(request):
+    """Stage latency histograms and token counters in the Prometheus text format"""
+    return PlainTextResponse(get_metrics().render(), media_type="text/plain; version=0.0.4")
+
+
+app = Starlette(routes=[
+    Route("/", index),
+    Route("/submit", submit, methods=["POST"]),
+    Route("/metrics", metrics),
+])
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.getenv("HOST", "127.0.0.1"), port=int(os.getenv("PORT", "8000")))
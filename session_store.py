@@ -0,0 +1,254 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+SESSION_DB = os.getenv("SESSION_DB", "sessions.db")
+# Approximate bytes of live session state kept in RAM before idle sessions are evicted
+SESSION_MEMORY_BUDGET = int(os.getenv("SESSION_MEMORY_BUDGET", str(64 * 1024 * 1024)))
+# Sessions untouched for this long are deleted from disk
+SESSION_TTL = float(os.getenv("SESSION_TTL", str(7 * 24 * 3600)))
+FLUSH_INTERVAL = 0.5
+
+
+class SessionStore:
+    """
+    Durable interview sessions: SQLite in WAL mode on disk, an LRU of live
+    session objects in memory.
+
+    `save` snapshots a session and hands the JSON to a writer thread, which
+    coalesces repeated saves and commits them in one transaction per
+    flush on a connection of its own, so a turn never waits on the disk. `get` rehydrates a session
+    from pending writes or the database the first time it is asked for.
+    When the serialized size of the live sessions passes `memory_budget`,
+    the least recently used idle ones are dropped from RAM; they are
+    already on their way to disk and come back on the next `get`.
+
+    `restore(data)` builds a live object from a stored dict and
+    `snapshot(obj)` turns one back into a JSON-able dict; `is_idle(obj)`
+    guards sessions with a turn in flight from eviction.
+    """
+
+    def __init__(self, path=SESSION_DB, memory_budget=SESSION_MEMORY_BUDGET, restore=dict, snapshot=dict,
+                 is_idle=None, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.memory_budget = memory_budget
+        self.restore = restore
+        self.snapshot = snapshot
+        self.is_idle = is_idle or (lambda obj: True)
+        self.flush_interval = flush_interval
+        self._live = OrderedDict()  # session_id -> [obj, serialized size, saved at least once]
+        self._live_bytes = 0
+        self.unsaved_evictions = 0
+        self._pending = {}  # session_id -> (payload, updated_at), not yet on disk
+        self._flushing = {}  # Taken out of _pending by the flush that is writing them now
+        self._lock = threading.Lock()  # In-memory state only; never held across SQLite calls
+        self._wake = threading.Event()
+        self._closed = False
+        # Commits go through their own connection so reads of other sessions don't queue behind an fsync
+        self._write_conn = self._connect()
+        self._write_lock = threading.Lock()
+        if path == ":memory:":
+            # Every connection to :memory: is a database of its own
+            self._conn, self._read_lock = self._write_conn, self._write_lock
+        else:
+            self._conn, self._read_lock = self._connect(), threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name="session-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL with NORMAL sync survives process crashes; only power loss can drop the last commits
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.commit()
+        return conn
+
+    def get(self, session_id):
+        """Return the live session object, rehydrating it from storage if needed; None if unknown"""
+        with self._lock:
+            entry = self._live.get(session_id)
+            if entry is not None:
+                self._live.move_to_end(session_id)
+                return entry[0]
+        payload = self._payload(session_id)
+        if payload is None:
+            return None
+        with self._lock:
+            # Another request may have rehydrated it meanwhile; keep the first copy
+            entry = self._live.get(session_id)
+            if entry is not None:
+                return entry[0]
+        obj = self.restore(json.loads(payload))
+        self._remember(session_id, obj, len(payload), saved=True)
+        return obj
+
+    def add(self, session_id, obj):
+        """Track a new live session; it counts against the budget at its snapshot size"""
+        size = len(json.dumps(self.snapshot(obj), ensure_ascii=False, default=_skip))
+        self._remember(session_id, obj, size, saved=False)
+        return obj
+
+    def save(self, session_id, obj=None):
+        """Snapshot a live session now and persist it in the background"""
+        if obj is None:
+            with self._lock:
+                entry = self._live.get(session_id)
+            if entry is None:
+                return
+            obj = entry[0]
+        payload = self.write(session_id, self.snapshot(obj))
+        self._remember(session_id, obj, len(payload), saved=True)
+
+    def write(self, session_id, data):
+        """Queue a plain state dict for the writer thread; returns the serialized payload"""
+        payload = json.dumps(data, ensure_ascii=False, default=_skip)
+        with self._lock:
+            self._pending[session_id] = (payload, time.time())
+        self._wake.set()
+        return payload
+
+    def load(self, session_id):
+        """Return a session's stored state dict, or None"""
+        payload = self._payload(session_id)
+        return json.loads(payload) if payload is not None else None
+
+    def _payload(self, session_id):
+        """Latest serialized state: a pending write if there is one, else the stored row"""
+        with self._lock:
+            pending = self._pending.get(session_id) or self._flushing.get(session_id)
+        if pending is not None:
+            return pending[0]
+        with self._read_lock:
+            row = self._conn.execute("SELECT state FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def delete(self, session_id):
+        with self._lock:
+            entry = self._live.pop(session_id, None)
+            if entry is not None:
+                self._live_bytes -= entry[1]
+            self._pending.pop(session_id, None)
+        # After any flush in progress, which could write the row back
+        with self._write_lock:
+            self._write_conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            self._write_conn.commit()
+
+    def purge(self, max_age=SESSION_TTL):
+        """Delete sessions not saved for `max_age` seconds; returns how many went"""
+        with self._write_lock:
+            cursor = self._write_conn.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - max_age,))
+            self._write_conn.commit()
+        return cursor.rowcount
+
+    def stats(self):
+        with self._lock:
+            return {
+                "live": len(self._live),
+                "live_bytes": self._live_bytes,
+                "pending": len(self._pending),
+                "unsaved_evictions": self.unsaved_evictions,
+            }
+
+    def flush(self):
+        """Write every pending snapshot now, in one transaction"""
+        with self._write_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                # Still readable from _flushing until the commit lands
+                self._flushing, self._pending = self._pending, {}
+            rows = [(session_id, payload, updated_at) for session_id, (payload, updated_at) in self._flushing.items()]
+            try:
+                self._write_conn.executemany(
+                    "INSERT INTO sessions (id, state, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at",
+                    rows,
+                )
+                self._write_conn.commit()
+            except sqlite3.Error:
+                self._write_conn.rollback()
+                with self._lock:
+                    # Put them back unless a newer save came in meanwhile
+                    self._pending = {**self._flushing, **self._pending}
+                raise
+            finally:
+                with self._lock:
+                    self._flushing = {}
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+        self.flush()
+        if self._conn is not self._write_conn:
+            self._conn.close()
+        self._write_conn.close()
+
+    def _write_loop(self):
+        while not self._closed:
+            self._wake.wait()
+            self._wake.clear()
+            # Let saves from the same burst of turns pile up into one commit
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass  # Snapshots stay in memory until a later flush or the next save
+
+    def _remember(self, session_id, obj, size, saved):
+        with self._lock:
+            entry = self._live.get(session_id)
+            if entry is not None:
+                self._live_bytes -= entry[1]
+            self._live[session_id] = [obj, size, saved]
+            self._live.move_to_end(session_id)
+            self._live_bytes += size
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used idle sessions until the live set fits the budget"""
+        if self._live_bytes <= self.memory_budget:
+            return
+        for session_id in list(self._live):
+            if self._live_bytes <= self.memory_budget or len(self._live) <= 1:
+                break
+            obj, size, saved = self._live[session_id]
+            # Busy sessions would come back as a second copy. Never-saved ones haven't
+            # finished a turn, so dropping them only loses a fresh interview.
+            if not self.is_idle(obj):
+                continue
+            del self._live[session_id]
+            self._live_bytes -= size
+            if not saved:
+                self.unsaved_evictions += 1
+
+
+def _skip(value):
+    """json default: drop per-turn objects (test and profile reports) from snapshots"""
+    return None
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store(**kwargs):
+    """
+    Return the process-wide session store, creating it on first use.
+    Pending writes are flushed when the process exits.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore(**kwargs)
+            _store.purge()
+            atexit.register(_store.close)
+        return _store
@@ -0,0 +1,80 @@
+import time
+
+CURSOR = "▌"
+
+
+def iter_deltas(response):
+    """Yield the text content of each chunk in an OpenAI chat completion stream"""
+    for chunk in response:
+        if not chunk.choices:
+            continue
+        content = chunk.choices[0].delta.content
+        if content:
+            yield content
+
+
+async def aiter_deltas(response):
+    """Yield the text content of each chunk in an async chat completion stream"""
+    async for chunk in response:
+        if not chunk.choices:
+            continue
+        content = chunk.choices[0].delta.content
+        if content:
+            yield content
+
+
+class StreamRenderer:
+    """
+    Buffer streamed text and repaint a Streamlit placeholder at a capped rate.
+
+    Chunks are kept in a list and only joined when a frame is painted, so
+    building the response stays linear and the markdown is re-rendered at
+    most `fps` times per second. A frame is also forced once `max_pending`
+    characters have piled up since the last paint.
+    """
+
+    def __init__(self, placeholder, fps=20, max_pending=2048, cursor=CURSOR):
+        self.placeholder = placeholder
+        self.interval = 1.0 / fps if fps else 0.0
+        self.max_pending = max_pending
+        self.cursor = cursor
+        self._parts = []
+        self._pending = 0
+        self._last_flush = 0.0
+
+    def write(self, text):
+        """Add a chunk of text, painting a frame if the budget allows"""
+        if not text:
+            return
+        self._parts.append(text)
+        self._pending += len(text)
+        now = time.monotonic()
+        if self._pending >= self.max_pending or now - self._last_flush >= self.interval:
+            self._paint(self.text + self.cursor, now)
+
+    @property
+    def text(self):
+        """Text received so far"""
+        if len(self._parts) > 1:
+            # Collapse the parts so later joins only touch new chunks
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def finish(self, text=None):
+        """Paint the final frame without the cursor and return the full text"""
+        final = self.text if text is None else text
+        self._paint(final, time.monotonic())
+        return final
+
+    def _paint(self, content, now):
+        self.placeholder.markdown(content)
+        self._pending = 0
+        self._last_flush = now
+
+
+def render_stream(placeholder, response, **kwargs):
+    """Render an OpenAI chat completion stream into a placeholder and return the text"""
+    renderer = StreamRenderer(placeholder, **kwargs)
+    for content in iter_deltas(response):
+        renderer.write(content)
+    return renderer.finish()
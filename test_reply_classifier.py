@@ -0,0 +1,83 @@
+import pytest
+
+from personas import CASUAL_LINES, FORMAL_LINES
+from reply_classifier import INPUT_PHRASES, REPLY_PHRASES, classify_input, classify_reply
+
+# Events the interview engine waits for after each scripted line
+LINE_EVENTS = {
+    "ready": "ready_for_coding",
+    "clarify": "clarify_prompt",
+    "approach": "question_mark",
+    "code": "code_it_up",
+    "first_challenge": "coding_challenge",
+    "next_challenge": "coding_challenge",
+}
+
+
+def naive_events(phrases, text):
+    """What the matcher replaced: one `in` check per phrase"""
+    text = text.lower().replace("’", "'").replace("‘", "'")
+    return {event for phrase, event in phrases.items() if phrase in text}
+
+
+def render(line):
+    return line.format(name="Sam", statement="Reverse a linked list.", channels="sam@example.com")
+
+
+@pytest.mark.parametrize("phrase, event", sorted(REPLY_PHRASES.items()))
+def test_reply_phrase_raises_its_event(phrase, event):
+    assert event in classify_reply(f"Okay then. {phrase.upper()} Let's keep going")
+
+
+@pytest.mark.parametrize("phrase, event", sorted(INPUT_PHRASES.items()))
+def test_input_phrase_raises_its_event(phrase, event):
+    assert event in classify_input(f"Hmm, {phrase.title()} I think")
+
+
+@pytest.mark.parametrize("lines", [CASUAL_LINES, FORMAL_LINES], ids=["casual", "formal"])
+@pytest.mark.parametrize("key, event", sorted(LINE_EVENTS.items()))
+def test_scripted_line_raises_its_event(lines, key, event):
+    assert event in classify_reply(render(lines[key]))
+
+
+@pytest.mark.parametrize("lines", [CASUAL_LINES, FORMAL_LINES], ids=["casual", "formal"])
+def test_scripted_lines_match_naive_scan(lines):
+    for line in lines.values():
+        text = render(line)
+        assert classify_reply(text).events == naive_events(REPLY_PHRASES, text)
+
+
+@pytest.mark.parametrize("apostrophe", ["'", "’", "‘"])
+def test_apostrophes_are_straightened(apostrophe):
+    events = classify_reply(f"Great work! That{apostrophe}s a wrap. So, what{apostrophe}s up next?")
+    assert {"wrap_up", "whats_up"} <= events.events
+
+
+def test_longer_phrase_raises_the_phrases_it_contains():
+    events = classify_reply("Correctness looks good.")
+    assert {"correctness", "correct"} <= events.events
+
+
+@pytest.mark.parametrize("text, score", [
+    ("Score: **28**/33", 28),
+    ("score: 28/33", 28),
+    ("Overall SCORE : ** 7 **", 7),
+    ("Your score: 100/100!", 100),
+])
+def test_score_is_read(text, score):
+    assert classify_reply(text).score == score
+
+
+@pytest.mark.parametrize("text", [
+    "Nice work, no score this time.",
+    "Score: pending",
+    "",
+])
+def test_missing_score_is_none(text):
+    assert classify_reply(text).score is None
+
+
+def test_merge_keeps_the_first_score():
+    merged = classify_reply("Score: 20/33").merge(classify_reply("Score: 30/33 nice"))
+    assert merged.score == 20
+    assert "nice" in merged
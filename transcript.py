@@ -0,0 +1,121 @@
+import sys
+
+ROLES = ("system", "user", "assistant")
+ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+
+
+class Transcript:
+    """
+    A session's chat messages, stored column-wise.
+
+    Roles are one byte each in a bytearray and contents sit in a parallel
+    list, so a message costs a byte and a pointer instead of a dict. System
+    texts (the persona prompt, the closing line) are interned, so every
+    session in the process, including ones rehydrated from storage, shares
+    one copy. Indexing returns a plain {"role", "content"} dict, and
+    slicing returns a lazy view, so building a request only materializes
+    the messages that make it into the window.
+    """
+
+    __slots__ = ("_roles", "_contents")
+
+    def __init__(self, messages=()):
+        self._roles = bytearray()
+        self._contents = []
+        for message in messages:
+            self.append(message)
+
+    def append(self, message):
+        role, content = message["role"], message["content"]
+        self._roles.append(ROLE_CODES[role])
+        self._contents.append(sys.intern(content) if role == "system" else content)
+
+    def __len__(self):
+        return len(self._contents)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TranscriptView(self, range(len(self))[index])
+        return {"role": ROLES[self._roles[index]], "content": self._contents[index]}
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __reversed__(self):
+        return (self[i] for i in reversed(range(len(self))))
+
+    def __repr__(self):
+        return f"Transcript({len(self)} messages)"
+
+    def to_list(self):
+        """Plain list of message dicts, for JSON snapshots"""
+        return list(self)
+
+
+class TranscriptView:
+    """A lazy slice of a Transcript; messages are built as they are read"""
+
+    __slots__ = ("_transcript", "_indices")
+
+    def __init__(self, transcript, indices):
+        self._transcript = transcript
+        self._indices = indices
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TranscriptView(self._transcript, self._indices[index])
+        return self._transcript[self._indices[index]]
+
+    def __iter__(self):
+        return (self._transcript[i] for i in self._indices)
+
+    def __reversed__(self):
+        return (self._transcript[i] for i in reversed(self._indices))
+
+
+class ExchangeRing:
+    """
+    The last `capacity` user/assistant exchanges, in a fixed ring of slots.
+
+    Recording an exchange overwrites the oldest one in place, so memory
+    stays constant however long the chat runs, and `payload` hands back
+    the messages already shaped for a chat completion request.
+    """
+
+    __slots__ = ("capacity", "_slots", "_next", "_count")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._slots = [None] * (2 * capacity)
+        self._next = 0  # Exchange slot the next record overwrites
+        self._count = 0
+
+    def record(self, user, assistant):
+        if not self.capacity:
+            return
+        at = 2 * self._next
+        self._slots[at] = {"role": "user", "content": user}
+        self._slots[at + 1] = {"role": "assistant", "content": assistant}
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def __len__(self):
+        return self._count
+
+    def messages(self):
+        """Remembered messages, oldest first"""
+        if self._count < self.capacity:
+            return self._slots[:2 * self._count]
+        at = 2 * self._next
+        return self._slots[at:] + self._slots[:at]
+
+    def payload(self, system, user_input):
+        """Request messages: the system prompt, the remembered exchanges and the new input"""
+        return [{"role": "system", "content": system}, *self.messages(), {"role": "user", "content": user_input}]
+
+    def clear(self):
+        self._slots = [None] * (2 * self.capacity)
+        self._next = self._count = 0